@@ -12,7 +12,7 @@ from src.tracker import TokenTracker
 from src.storage import CSVStorage
 from src.storage.user_manager import UserManager
 from src.bot import TelegramNotifier, TelegramHandler
-from src.utils import config
+from src.utils import get_config
 
 def setup_logging():
     # Create logs directory if it doesn't exist
@@ -79,6 +79,7 @@ async def main():
     
     logger.info("🚀 Starting Crypto Trading Bot...")
     
+    config = get_config()
     try:
         config.validate()
         logger.info("✅ Configuration validated successfully")
@@ -102,8 +103,7 @@ async def main():
             if active_chat_ids:
                 first_user = active_chat_ids[0]
                 logger.info(f"Migrating {len(tokens_to_track)} legacy tokens to user {first_user}")
-                for token in tokens_to_track:
-                    user_manager.add_token_to_user(first_user, token)
+                user_manager.bulk_add_tokens(first_user, [(token, None) for token in tokens_to_track])
                 for token, threshold_data in token_thresholds.items():
                     user_manager.set_user_token_threshold(
                         first_user, token, 
@@ -187,6 +187,7 @@ async def main():
         print("\nStopping bot...")
         await tracker.stop()
         await telegram_handler.shutdown()
+        user_manager.close()
         logger.info("✅ Bot stopped successfully")
         print("Bot stopped.")
 
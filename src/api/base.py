@@ -4,6 +4,9 @@ import aiohttp
 import asyncio
 from datetime import datetime
 
+# Bounds every request so one hung endpoint cannot stall a whole polling round
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
 class APIError(Exception):
     pass
 
@@ -11,37 +14,51 @@ class RateLimitError(APIError):
     pass
 
 class BaseAPI(ABC):
-    def __init__(self, base_url: str, rate_limit: float = 1.0):
+    def __init__(self, base_url: str, rate_limit: float = 1.0,
+                 connector: Optional[aiohttp.BaseConnector] = None,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
         self.base_url = base_url
         self.rate_limit = rate_limit
         self.last_request_time = 0
         self.session: Optional[aiohttp.ClientSession] = None
+        # A connector passed in is shared with other clients and closed by its owner, not by this session
+        self.connector = connector
+        self.timeout = timeout or _DEFAULT_TIMEOUT
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Idempotent: entering again reuses the open session instead of replacing (and leaking) it
+        self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=self.connector,
+                connector_owner=self.connector is None,
+                timeout=self.timeout
+            )
+        return self.session
+    
     async def _rate_limit_check(self):
         current_time = asyncio.get_event_loop().time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.rate_limit:
-            await asyncio.sleep(self.rate_limit - time_since_last_request)
-        self.last_request_time = asyncio.get_event_loop().time()
+        # Claim the next free slot before sleeping, so concurrent callers space out instead of all firing at once
+        slot = max(current_time, self.last_request_time + self.rate_limit)
+        self.last_request_time = slot
+        if slot > current_time:
+            await asyncio.sleep(slot - current_time)
     
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         await self._rate_limit_check()
         
-        if not self.session or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        
+        session = self._ensure_session()
         url = f"{self.base_url}{endpoint}"
         
         try:
-            async with self.session.request(method, url, **kwargs) as response:
+            async with session.request(method, url, **kwargs) as response:
                 if response.status == 429:
                     raise RateLimitError("Rate limit exceeded")
                 
@@ -1,7 +1,8 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
 from .base import BaseAPI, APIError
+import asyncio
 import base64
 import struct
 import aiohttp
@@ -10,14 +11,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 class SolanaTracker(BaseAPI):
-    def __init__(self, rpc_url: str):
-        super().__init__(rpc_url, rate_limit=0.1)
+    def __init__(self, rpc_url: str, connector: Optional[aiohttp.BaseConnector] = None,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        super().__init__(rpc_url, rate_limit=0.1, connector=connector, timeout=timeout)
         self.client = AsyncClient(rpc_url)
     
-    async def __aenter__(self):
-        return self
-    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await super().__aexit__(exc_type, exc_val, exc_tb)
         await self.client.close()
     
     async def get_token_supply(self, token_address: str) -> Dict[str, Any]:
@@ -57,49 +57,67 @@ class SolanaTracker(BaseAPI):
             if holder_count > 0:
                 return holder_count
         except Exception as e:
-            logger.debug(f"Alternative APIs failed: {e}")
+            logger.debug("Alternative APIs failed: %s", e)
         
         # Method 2: Fallback to simplified RPC-based approach
         # For now, skip complex RPC parsing and return 0 to avoid errors
         # This can be improved later with better RPC handling
-        logger.debug(f"Skipping direct RPC holder count for {token_address} - using API methods only")
+        logger.debug("Skipping direct RPC holder count for %s - using API methods only", token_address)
         return 0
     
+    async def get_token_holders_counts_batch(self, token_addresses: List[str], max_concurrency: int = 8) -> Dict[str, int]:
+        """Holder counts for many tokens, at most max_concurrency lookups in flight; failed lookups are left out"""
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded(token_address: str) -> int:
+            async with sem:
+                return await self.get_token_holders_count(token_address)
+        
+        results = await asyncio.gather(*(bounded(address) for address in token_addresses), return_exceptions=True)
+        counts = {}
+        for address, result in zip(token_addresses, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching holder count for {address}: {result}")
+            else:
+                counts[address] = result
+        return counts
+    
     async def _get_holders_alternative_apis(self, token_address: str) -> int:
         """Try alternative free APIs for holder count"""
         
+        # Both lookups go through the client's pooled session so connections are kept alive between rounds
+        session = self._ensure_session()
+        
         # Try GMGN API (appears to be free)
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://gmgn.ai/defi/quotation/v1/tokens/sol/{token_address}"
-                
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("code") == 0 and "data" in data:
-                            token_info = data["data"].get("token", {})
-                            holder_count = token_info.get("holder_count", 0)
-                            if holder_count > 0:
-                                logger.info(f"GMGN API: Token {token_address} has {holder_count} holders")
-                                return int(holder_count)
+            url = f"https://gmgn.ai/defi/quotation/v1/tokens/sol/{token_address}"
+            
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get("code") == 0 and "data" in data:
+                        token_info = data["data"].get("token", {})
+                        holder_count = token_info.get("holder_count", 0)
+                        if holder_count > 0:
+                            logger.info("GMGN API: Token %s has %s holders", token_address, holder_count)
+                            return int(holder_count)
         except Exception as e:
-            logger.debug(f"GMGN API error: {e}")
+            logger.debug("GMGN API error: %s", e)
         
         # Try Pump.fun API for pump tokens
         try:
             if "pump" in token_address.lower():
-                async with aiohttp.ClientSession() as session:
-                    url = f"https://frontend-api.pump.fun/coins/{token_address}"
-                    
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            holder_count = data.get("holder_count", 0)
-                            if holder_count > 0:
-                                logger.info(f"Pump.fun API: Token {token_address} has {holder_count} holders")
-                                return int(holder_count)
+                url = f"https://frontend-api.pump.fun/coins/{token_address}"
+                
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        holder_count = data.get("holder_count", 0)
+                        if holder_count > 0:
+                            logger.info("Pump.fun API: Token %s has %s holders", token_address, holder_count)
+                            return int(holder_count)
         except Exception as e:
-            logger.debug(f"Pump.fun API error: {e}")
+            logger.debug("Pump.fun API error: %s", e)
         
         return 0
     
@@ -0,0 +1,25 @@
+from telegram.request import HTTPXRequest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that parses Telegram API responses with orjson when it is available.
+
+    python-telegram-bot form-encodes outgoing parameters one by one, so the only
+    whole-payload JSON step on our side of the wire is decoding the response body.
+    """
+
+    @staticmethod
+    def parse_json_payload(payload: bytes):
+        if orjson is None:
+            return HTTPXRequest.parse_json_payload(payload)
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Invalid UTF-8 or malformed JSON: defer to the lenient stdlib path,
+            # which raises the usual TelegramError if it can't parse either
+            return HTTPXRequest.parse_json_payload(payload)
@@ -1,50 +1,321 @@
 import asyncio
-import re
+import sys
+import time
 import logging
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
-from typing import Optional, Set
-from ..utils import config
+from typing import Any, Dict, Final, List, Optional, Set, Tuple
+from ..utils import get_config
+from ..utils.tokens import CHANGE_FIELDS, INFO_FIELDS, MARKET_FIELDS, PRICE, SOLANA_ADDR_RE, USD, change_lines, entry_lines, render_fields, token_info_lines
 from ..storage.user_manager import UserManager
+from .json_request import OrjsonRequest
 
 logger = logging.getLogger(__name__)
 
+# How long fetched token info is reused across menus and button presses
+_TOKEN_INFO_TTL: Final[float] = 20.0
+_TOKEN_INFO_CACHE_SIZE: Final[int] = 1024
+
+# Minimum spacing between edits of the same message, to stay under Telegram's flood limit
+_EDIT_INTERVAL: Final[float] = 0.8
+
+# Tokens listed per page in the remove/reset/get token pickers
+_PAGE_SIZE: Final[int] = 8
+
+
+@lru_cache(maxsize=1024)
+def _chat_key(chat_id: int) -> str:
+    """UserManager key for a Telegram chat id, memoized so repeat chats reuse one str"""
+    return str(chat_id)
+
+
+@lru_cache(maxsize=2048)
+def _btn(text: str, callback_data: str) -> InlineKeyboardButton:
+    """Shared callback button; PTB buttons are immutable, so identical ones can be reused"""
+    return InlineKeyboardButton(text, callback_data=callback_data)
+
+
+def _already_tracking_text(token_data: Dict[str, Any], threshold_config: Dict[str, Any], entry_price: Optional[float]) -> str:
+    """Summary shown when a user adds a token they already track"""
+    return "".join([
+        "ℹ️ **Already Tracking This Token**\n\n",
+        f"🏷️ **Name:** {token_data['name']}\n",
+        f"🔤 **Symbol:** {token_data['symbol']}\n",
+        f"💰 **Current Price:** {PRICE(token_data['price'])}\n",
+        *entry_lines(token_data['price'], entry_price),
+        f"📈 **Market Cap:** {USD(token_data.get('market_cap', 0))}\n",
+        f"💧 **Liquidity:** {USD(token_data.get('liquidity', 0))}\n",
+        f"🎯 **Your Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n",
+    ])
+
+
+@lru_cache(maxsize=1024)
+def _tracked_token_markup(token_address: str) -> InlineKeyboardMarkup:
+    """Reset / Set Threshold / Remove actions for a token the user tracks"""
+    return InlineKeyboardMarkup([
+        [_btn("🔄 Reset Price Reference", f"reset_price:{token_address}"), _btn("⚙️ Set Threshold", f"set_threshold:{token_address}")],
+        [_btn("❌ Remove Token", f"remove:{token_address}")]
+    ])
+
+
+@lru_cache(maxsize=1024)
+def _token_query_markup(token_address: str) -> InlineKeyboardMarkup:
+    """Track / Refresh / Copy actions shown under a token lookup"""
+    return InlineKeyboardMarkup([
+        [_btn("➕ Track This", f"track:{token_address}"), _btn("🔄 Refresh", f"refresh:{token_address}")],
+        [_btn("📋 Copy Address", f"copy:{token_address}")]
+    ])
+
+
+@lru_cache(maxsize=4096)
+def _shortaddr(token_address: str) -> str:
+    """Shortened first8...last8 form of a token address used as a display fallback"""
+    return f"{token_address[:8]}...{token_address[-8:]}"
+
+
+# Static usage/help bodies, built once at import instead of on every error path
+_THRESHOLD_USAGE: Final[str] = "Usage: /threshold <value>\nExample: /threshold 15"
+
+_SET_THRESHOLD_USAGE: Final[str] = (
+    "Usage: /setthreshold <token_address> <threshold> [direction]\n\n"
+    "Directions:\n"
+    "• `both` - Alert on positive OR negative changes (default)\n"
+    "• `positive` - Alert only on price increases\n"
+    "• `negative` - Alert only on price decreases\n\n"
+    "Examples:\n"
+    "• `/setthreshold 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump 25`\n"
+    "• `/setthreshold 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump 15 positive`"
+)
+
+_ADD_USAGE: Final[str] = "Usage: /add <token_address>"
+
+_GET_USAGE: Final[str] = "Usage: /get <token_name/symbol/address>\nExample: /get MASK or /get catwifmask"
+
+_REMOVE_USAGE: Final[str] = "Usage: /remove <token_address>"
+
+_RESET_USAGE: Final[str] = (
+    "Usage: /reset <token_address>\n\n"
+    "This will reset the price reference to the current price.\n"
+    "Future alerts will use this new price as the baseline.\n\n"
+    "Example: `/reset 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump`"
+)
+
+_ADD_TOKEN_INSTRUCTIONS: Final[str] = (
+    "To add a token, send me the token address.\n\n"
+    "Format: <code>token_address</code>\n"
+    "Example: <code>6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump</code>"
+)
+
+_SET_THRESHOLD_PROMPT: Final[str] = (
+    "To set a new price threshold, send me a number.\n\n"
+    "Your current threshold: {threshold}%\n"
+    "Example: <code>15</code> (for 15%)"
+)
+
+_RESET_PRICE_HEADER: Final[str] = (
+    "🔄 **Reset Price Reference**\n\n"
+    "Select a token to reset its price reference to the current price. "
+    "Future alerts will use this new price as the baseline.\n\n"
+    "Select a token:"
+)
+
+_GET_TOKEN_EXAMPLES: Final[str] = (
+    "• Token name: <code>MASK</code>\n"
+    "• Token symbol: <code>catwifmask</code>\n"
+    "• Token address: <code>6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump</code>"
+)
+
+_HELP_MESSAGE: Final[str] = (
+    "❓ **Help - Crypto Trading Bot**\n\n"
+    "**Commands:**\n"
+    "• `/start` - Initialize the bot and show menu\n"
+    "• `/status` - Show your bot status and settings\n"
+    "• `/tokens` - List your tracked tokens\n"
+    "• `/add <address>` - Add a token to track\n"
+    "• `/remove <address>` - Remove a token\n"
+    "• `/get <name/symbol/address>` - Get token info\n"
+    "• `/threshold <number>` - Set your global price threshold\n"
+    "• `/setthreshold <address> <threshold> [direction]` - Set custom token threshold\n"
+    "• `/reset <address>` - Reset price reference to current price\n"
+    "• `/stop` - Stop receiving alerts\n\n"
+    "**Buttons:**\n"
+    "• 📊 **Status** - View your bot status\n"
+    "• 🪙 **Tokens** - View your tracked tokens\n"
+    "• ➕ **Add Token** - Instructions to add tokens\n"
+    "• ➖ **Remove Token** - Select tokens to remove\n"
+    "• 📈 **Get Token Info** - Instructions for token lookup\n"
+    "• ⚙️ **Set Threshold** - Instructions to set price threshold\n"
+    "• 🔄 **Reset Price** - Reset price reference for tokens\n"
+    "• 📊 **Recap** - Summary of your tracked tokens\n"
+    "• ❓ **Help** - This help message\n"
+    "• ❌ **Stop Alerts** - Unsubscribe from notifications\n\n"
+    "**Tips:**\n"
+    "• Send a token address directly to track it\n"
+    "• Send a number (1-100) to set price threshold\n"
+    "• Send a token name/symbol to get info\n"
+    "• Use custom thresholds for specific tokens\n"
+    "• Set direction to 'positive', 'negative', or 'both'\n"
+    "• Reset price reference to start fresh tracking\n"
+    "• Each user has their own tracking list and settings\n\n"
+    "**Examples:**\n"
+    "• `6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump`\n"
+    "• `15` (sets 15% threshold)\n"
+    "• `MASK` or `catwifmask`"
+)
+
+# Emoji shown next to a threshold for each alert direction
+_DIRECTION_EMOJI: Final[Dict[str, str]] = {
+    'both': '📊',
+    'positive': '📈',
+    'negative': '📉'
+}
+
+
 class TelegramHandler:
     def __init__(self, user_manager: UserManager):
         self.app: Optional[Application] = None
         self.user_manager = user_manager
         self.tracker = None
+        self._token_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._main_menu_markup = self._build_main_menu_keyboard()
+        self._threshold_set_markup = InlineKeyboardMarkup([
+            [_btn("📊 Status", "status"), _btn("🪙 Tokens", "tokens")],
+            [_btn("📈 Main Menu", "back_to_main")]
+        ])
+        self._last_edit: Dict[Any, float] = {}
+        self._pending_edits: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+        # Scheduled _flush_edit tasks, referenced here so they are not garbage collected mid-sleep
+        self._edit_tasks: Set[asyncio.Task] = set()
     
     def set_tracker(self, tracker):
         self.tracker = tracker
     
+    async def _cached_token_info(self, token_identifier: str, fresh: bool = False) -> Dict[str, Any]:
+        """Get token info through a short-lived cache so repeated lookups skip the API; fresh refetches it"""
+        if fresh:
+            # An explicit refresh must not be served from this cache, an older in-flight fetch or the tracker's
+            token_data = await self.tracker.get_token_info_with_timestamp(token_identifier, fresh=True)
+        else:
+            cached = self._token_info_cache.get(token_identifier)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            # Join an identical fetch that is already running instead of issuing another
+            inflight = self._inflight.get(token_identifier)
+            if inflight is None:
+                inflight = asyncio.ensure_future(self.tracker.get_token_info_with_timestamp(token_identifier))
+                self._inflight[token_identifier] = inflight
+                inflight.add_done_callback(lambda _: self._inflight.pop(token_identifier, None))
+            # Shielded so one caller being cancelled doesn't fail the others
+            token_data = await asyncio.shield(inflight)
+        
+        now = time.monotonic()
+        if len(self._token_info_cache) >= _TOKEN_INFO_CACHE_SIZE:
+            self._token_info_cache = {k: v for k, v in self._token_info_cache.items() if v[0] > now}
+        self._token_info_cache[token_identifier] = (now + _TOKEN_INFO_TTL, token_data)
+        return token_data
+    
+    def _invalidate_token_info(self, token_address: str):
+        """Drop a cached token info entry after its state changed"""
+        self._token_info_cache.pop(token_address, None)
+    
+    async def _reply(self, query, text: str, *, parse_mode: Optional[str] = None, markup: Optional[InlineKeyboardMarkup] = None,
+                     disable_web_page_preview: Optional[bool] = None):
+        """Edit a callback query's message, defaulting to the main menu keyboard"""
+        return await query.edit_message_text(text, parse_mode=parse_mode, reply_markup=markup or self._main_menu_markup,
+                                             disable_web_page_preview=disable_web_page_preview)
+    
+    async def _throttled_edit(self, query, text: str, **kwargs):
+        """Edit a message at most once per _EDIT_INTERVAL, coalescing bursts into the latest text"""
+        key = query.inline_message_id or (query.message.chat_id, query.message.message_id)
+        now = time.monotonic()
+        wait = self._last_edit.get(key, 0.0) + _EDIT_INTERVAL - now
+        if wait <= 0:
+            if len(self._last_edit) >= 1024:
+                self._last_edit = {k: t for k, t in self._last_edit.items() if now - t < _EDIT_INTERVAL}
+            self._last_edit[key] = now
+            return await query.edit_message_text(text, **kwargs)
+        
+        # An edit is already scheduled for this message: just swap in the newer text
+        already_scheduled = key in self._pending_edits
+        self._pending_edits[key] = (text, kwargs)
+        if not already_scheduled:
+            task = asyncio.create_task(self._flush_edit(query, key, wait))
+            self._edit_tasks.add(task)
+            task.add_done_callback(self._edit_tasks.discard)
+    
+    async def _flush_edit(self, query, key, delay: float):
+        """Send the latest coalesced edit for a message once its interval has passed"""
+        await asyncio.sleep(delay)
+        text, kwargs = self._pending_edits.pop(key)
+        self._last_edit[key] = time.monotonic()
+        try:
+            await query.edit_message_text(text, **kwargs)
+        except Exception as e:
+            logger.warning(f"Deferred message edit failed: {e}")
+    
+    async def _resolve_token_displays(self, token_addresses: List[str], prefix: str = "$") -> List[str]:
+        """Resolve display labels for several tokens at once, falling back to the short address"""
+        if not self.tracker:
+            return [_shortaddr(addr) for addr in token_addresses]
+        
+        # Labels only need the symbol, which the tracker usually already holds in memory
+        symbols = await asyncio.gather(*(self.tracker.get_symbol(addr) for addr in token_addresses))
+        return [
+            f"{prefix}{symbol}" if symbol else _shortaddr(addr)
+            for addr, symbol in zip(token_addresses, symbols)
+        ]
+
+    @staticmethod
+    def _paginate(user_tokens: List[str], page: int, page_prefix: str):
+        """Slice one page of tokens and build its « Prev | Page x/y | Next » row"""
+        pages = max(1, -(-len(user_tokens) // _PAGE_SIZE))
+        page = max(0, min(page, pages - 1))
+        page_tokens = list(user_tokens)[page * _PAGE_SIZE:(page + 1) * _PAGE_SIZE]
+        
+        nav_row = []
+        if pages > 1:
+            if page > 0:
+                nav_row.append(_btn("« Prev", f"{page_prefix}:{page - 1}"))
+            nav_row.append(_btn(f"Page {page + 1}/{pages}", "separator"))
+            if page < pages - 1:
+                nav_row.append(_btn("Next »", f"{page_prefix}:{page + 1}"))
+        return page_tokens, nav_row
+    
     def get_main_menu_keyboard(self):
         """Return the main menu keyboard that should be shown with every message"""
+        return self._main_menu_markup
+    
+    @staticmethod
+    def _build_main_menu_keyboard() -> InlineKeyboardMarkup:
+        """Build the static main menu keyboard; done once per handler"""
         return InlineKeyboardMarkup([
             [
-                InlineKeyboardButton("📊 Status", callback_data="status"),
-                InlineKeyboardButton("🪙 Tokens", callback_data="tokens")
+                _btn("📊 Status", "status"),
+                _btn("🪙 Tokens", "tokens")
             ],
             [
-                InlineKeyboardButton("➕ Add Token", callback_data="add_token"),
-                InlineKeyboardButton("➖ Remove Token", callback_data="remove_token")
+                _btn("➕ Add Token", "add_token"),
+                _btn("➖ Remove Token", "remove_token")
             ],
             [
-                InlineKeyboardButton("📈 Get Token Info", callback_data="get_token"),
-                InlineKeyboardButton("⚙️ Set Threshold", callback_data="set_threshold")
+                _btn("📈 Get Token Info", "get_token"),
+                _btn("⚙️ Set Threshold", "set_threshold")
             ],
             [
-                InlineKeyboardButton("🔄 Reset Price", callback_data="reset_price"),
-                InlineKeyboardButton("📊 Recap", callback_data="recap")
+                _btn("🔄 Reset Price", "reset_price"),
+                _btn("📊 Recap", "recap")
             ],
             [
-                InlineKeyboardButton("❓ Help", callback_data="help"),
-                InlineKeyboardButton("❌ Stop Alerts", callback_data="stop_alerts")
+                _btn("❓ Help", "help"),
+                _btn("❌ Stop Alerts", "stop_alerts")
             ]
         ])
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         user_name = update.effective_user.username or update.effective_user.first_name
         
         # Register user with UserManager
@@ -61,7 +332,7 @@ class TelegramHandler:
             "Use the buttons below or type commands:"
         )
         
-        reply_markup = self.get_main_menu_keyboard()
+        reply_markup = self._main_menu_markup
         
         await update.message.reply_text(welcome_message, reply_markup=reply_markup)
     
@@ -69,11 +340,11 @@ class TelegramHandler:
         if not await self._is_authorized(update):
             return
         
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         user_data = self.user_manager.get_user(chat_id)
         
         if not user_data:
-            await update.message.reply_text("User not found. Please send /start first.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("User not found. Please send /start first.", reply_markup=self._main_menu_markup)
             return
         
         # Get user's tokens count
@@ -82,77 +353,64 @@ class TelegramHandler:
         status_message = (
             f"🟢 Bot Status: Active\n\n"
             f"Your Settings:\n"
-            f"• Price Threshold: {user_data['global_threshold']}%\n"
+            f"• Price Threshold: {user_data.global_threshold}%\n"
             f"• Tracked Tokens: {len(user_tokens)}\n"
-            f"• Alerts: {'Enabled' if user_data['active'] else 'Disabled'}\n\n"
+            f"• Alerts: {'Enabled' if user_data.active else 'Disabled'}\n\n"
             f"Global Settings:\n"
-            f"• Check Interval: {config.check_interval}s\n"
+            f"• Check Interval: {get_config().check_interval}s\n"
         )
         
-        await update.message.reply_text(status_message, reply_markup=self.get_main_menu_keyboard())
+        await update.message.reply_text(status_message, reply_markup=self._main_menu_markup)
     
     async def tokens_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not await self._is_authorized(update):
             return
         
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         if not user_tokens:
-            await update.message.reply_text("You are not tracking any tokens.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("You are not tracking any tokens.", reply_markup=self._main_menu_markup)
             return
         
+        user_global_threshold = self.user_manager.get_user_threshold(chat_id)['value']
+        token_displays = await self._resolve_token_displays(user_tokens)
+        
         message = "📊 Your Tracked Tokens:\n\n"
-        for i, token_address in enumerate(user_tokens, 1):
+        for i, (token_address, token_display) in enumerate(zip(user_tokens, token_displays), 1):
             threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
             threshold = threshold_config['value']
             direction = threshold_config.get('direction', 'both')
-            user_global_threshold = self.user_manager.get_user_threshold(chat_id)['value']
             
-            direction_emoji = {
-                'both': '📊',
-                'positive': '📈',
-                'negative': '📉'
-            }.get(direction, '📊')
-            
-            # Get token name/symbol for display
-            if self.tracker:
-                try:
-                    token_info = await self.tracker.get_token_info_with_timestamp(token_address)
-                    token_display = f"${token_info['symbol']}"
-                except:
-                    # Fallback to shortened address if token info unavailable
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
+            direction_emoji = _DIRECTION_EMOJI.get(direction, '📊')
             
             if threshold == user_global_threshold and direction == 'both':
                 message += f"{i}. <code>{token_display}</code> {direction_emoji} (Your Default: {threshold}%)\n"
             else:
                 message += f"{i}. <code>{token_display}</code> {direction_emoji} (Custom: {threshold}% {direction})\n"
         
-        await update.message.reply_text(message, parse_mode='HTML', reply_markup=self.get_main_menu_keyboard())
+        await update.message.reply_text(message, parse_mode='HTML', reply_markup=self._main_menu_markup)
     
     async def threshold_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not await self._is_authorized(update):
             return
         
         if not context.args or len(context.args) != 1:
-            await update.message.reply_text("Usage: /threshold <value>\nExample: /threshold 15", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(_THRESHOLD_USAGE, reply_markup=self._main_menu_markup)
             return
         
         try:
             new_threshold = float(context.args[0])
             if new_threshold <= 0 or new_threshold > 100:
-                await update.message.reply_text("Threshold must be between 0 and 100", reply_markup=self.get_main_menu_keyboard())
+                await update.message.reply_text("Threshold must be between 0 and 100", reply_markup=self._main_menu_markup)
                 return
             
-            chat_id = str(update.effective_chat.id)
+            chat_id = _chat_key(update.effective_chat.id)
             self.user_manager.set_user_global_threshold(chat_id, new_threshold)
             
-            await update.message.reply_text(f"✅ Your price threshold updated to {new_threshold}%", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(f"✅ Your price threshold updated to {new_threshold}%", reply_markup=self._main_menu_markup)
         except ValueError:
-            await update.message.reply_text("Invalid threshold value. Please enter a number.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Invalid threshold value. Please enter a number.", reply_markup=self._main_menu_markup)
     
     async def set_token_threshold_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Set threshold for a specific token: /setthreshold <token_address> <threshold> [direction]"""
@@ -160,20 +418,10 @@ class TelegramHandler:
             return
         
         if not context.args or len(context.args) < 2 or len(context.args) > 3:
-            await update.message.reply_text(
-                "Usage: /setthreshold <token_address> <threshold> [direction]\n\n"
-                "Directions:\n"
-                "• `both` - Alert on positive OR negative changes (default)\n"
-                "• `positive` - Alert only on price increases\n"
-                "• `negative` - Alert only on price decreases\n\n"
-                "Examples:\n"
-                "• `/setthreshold 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump 25`\n"
-                "• `/setthreshold 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump 15 positive`",
-                parse_mode='Markdown'
-            )
+            await update.message.reply_text(_SET_THRESHOLD_USAGE, parse_mode='Markdown')
             return
         
-        token_address = context.args[0]
+        token_address = sys.intern(context.args[0])
         direction = context.args[2].lower() if len(context.args) > 2 else 'both'
         
         if direction not in ['both', 'positive', 'negative']:
@@ -186,42 +434,26 @@ class TelegramHandler:
                 await update.message.reply_text("Threshold must be between 0 and 100")
                 return
             
-            chat_id = str(update.effective_chat.id)
-            user_tokens = self.user_manager.get_user_tokens(chat_id)
-            
-            if token_address not in user_tokens:
+            chat_id = _chat_key(update.effective_chat.id)
+            if not self.user_manager.user_owns_token(chat_id, token_address):
                 await update.message.reply_text(f"You are not tracking this token. Add it first with /add")
                 return
             
             # Update token threshold for this user
             self.user_manager.set_user_token_threshold(chat_id, token_address, threshold, direction)
             
-            # Add inline keyboard
-            keyboard = [
-                [
-                    InlineKeyboardButton("📊 Status", callback_data="status"),
-                    InlineKeyboardButton("🪙 Tokens", callback_data="tokens")
-                ],
-                [
-                    InlineKeyboardButton("📈 Main Menu", callback_data="back_to_main")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = self._threshold_set_markup
             
-            direction_emoji = {
-                'both': '📊',
-                'positive': '📈',
-                'negative': '📉'
-            }.get(direction, '📊')
+            direction_emoji = _DIRECTION_EMOJI.get(direction, '📊')
             
             if self.tracker:
                 try:
-                    token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+                    token_data = await self._cached_token_info(token_address)
                     token_display = f"${token_data['symbol']}"
                 except:
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
+                    token_display = _shortaddr(token_address)
             else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
+                token_display = _shortaddr(token_address)
                 
             await update.message.reply_text(
                 f"✅ Your threshold for {token_display} set to {threshold}% {direction_emoji} ({direction})",
@@ -229,55 +461,31 @@ class TelegramHandler:
             )
             
         except ValueError:
-            await update.message.reply_text("Invalid threshold value. Please enter a number.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Invalid threshold value. Please enter a number.", reply_markup=self._main_menu_markup)
     
     async def add_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not await self._is_authorized(update):
             return
         
         if not context.args or len(context.args) != 1:
-            await update.message.reply_text("Usage: /add <token_address>", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(_ADD_USAGE, reply_markup=self._main_menu_markup)
             return
         
-        token_address = context.args[0]
-        chat_id = str(update.effective_chat.id)
+        token_address = sys.intern(context.args[0])
+        chat_id = _chat_key(update.effective_chat.id)
         
         # Check if user already tracks this token
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        if token_address in user_tokens:
+        token_ctx = self.user_manager.get_token_context(chat_id, token_address)
+        if token_ctx['tracked']:
             # Show token info instead of error
             if self.tracker:
                 try:
-                    token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+                    token_data = await self._cached_token_info(token_address)
                     
-                    # Get user's threshold for this token
-                    threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
-                    entry_price = self.user_manager.get_entry_price(chat_id, token_address)
-                    
-                    message = f"ℹ️ **Already Tracking This Token**\n\n"
-                    message += f"🏷️ **Name:** {token_data['name']}\n"
-                    message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-                    message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-                    if entry_price:
-                        price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                        emoji = "📈" if price_change > 0 else "📉"
-                        message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                        message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-                    message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-                    message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-                    message += f"🎯 **Your Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n"
+                    message = _already_tracking_text(token_data, token_ctx['threshold'], token_ctx['entry_price'])
                     
                     # Add action buttons
-                    keyboard = [
-                        [
-                            InlineKeyboardButton("🔄 Reset Price Reference", callback_data=f"reset_price:{token_address}"),
-                            InlineKeyboardButton("⚙️ Set Threshold", callback_data=f"set_threshold:{token_address}")
-                        ],
-                        [
-                            InlineKeyboardButton("❌ Remove Token", callback_data=f"remove:{token_address}")
-                        ]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
+                    reply_markup = _tracked_token_markup(token_address)
                     
                     await update.message.reply_text(message, parse_mode='Markdown', reply_markup=reply_markup)
                     return
@@ -289,128 +497,51 @@ class TelegramHandler:
                 f"⚠️ You are already tracking this token.\n\n"
                 f"Address: <code>{token_address}</code>",
                 parse_mode='HTML',
-                reply_markup=self.get_main_menu_keyboard()
+                reply_markup=self._main_menu_markup
             )
             return
         
-        # Add token via tracker (handles entry price automatically)
-        if self.tracker:
-            await self.tracker.add_token(chat_id, token_address)
-        else:
-            # Fallback if tracker not available
-            self.user_manager.add_token_to_user(chat_id, token_address)
+        # Acknowledge right away so the user isn't left waiting on the DexScreener round-trip
+        pending = await update.message.reply_text("⏳ Adding token...")
         
-        await update.message.reply_text(f"✅ Token added to your tracking list!", reply_markup=self.get_main_menu_keyboard())
+        try:
+            # Add token via tracker (handles entry price automatically)
+            if self.tracker:
+                await self.tracker.add_token(chat_id, token_address)
+            else:
+                # Fallback if tracker not available
+                self.user_manager.add_token_to_user(chat_id, token_address)
+        except Exception as e:
+            await pending.edit_text(f"❌ Error adding token: {str(e)}", reply_markup=self._main_menu_markup)
+            return
+        
+        await pending.edit_text(f"✅ Token added to your tracking list!", reply_markup=self._main_menu_markup)
     
     async def get_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not await self._is_authorized(update):
             return
         
         if not context.args or len(context.args) != 1:
-            await update.message.reply_text("Usage: /get <token_name/symbol/address>\nExample: /get MASK or /get catwifmask", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(_GET_USAGE, reply_markup=self._main_menu_markup)
             return
         
         token_identifier = context.args[0]
         
         if not self.tracker:
-            await update.message.reply_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Tracker not available.", reply_markup=self._main_menu_markup)
             return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(token_identifier)
-            
-            # Format message with only requested variables
-            chat_id = str(update.effective_chat.id)
-            message = f"📊 **Token Information**\n\n"
-            message += f"🏷️ **Name:** {token_data['name']}\n"
-            message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-            message += f"🔗 **Address:** `{token_data['address']}`\n"
-            message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-            
-            # Check if user is tracking this token and show entry performance
-            user_tokens = self.user_manager.get_user_tokens(chat_id)
-            if token_data['address'] in user_tokens:
-                entry_price = self.user_manager.get_entry_price(chat_id, token_data['address'])
-                if entry_price:
-                    price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                    emoji = "📈" if price_change > 0 else "📉"
-                    message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                    message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-                message += f"🎯 **You're tracking this token**\n"
-            
-            message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-            message += f"📊 **24h Volume:** ${token_data.get('volume_24h', 0):,.2f}\n"
-            
-            # Volume 1h and 6h if available
-            if token_data.get('volume_1h', 0) > 0:
-                message += f"📊 **1h Volume:** ${token_data['volume_1h']:,.2f}\n"
-            if token_data.get('volume_6h', 0) > 0:
-                message += f"📊 **6h Volume:** ${token_data['volume_6h']:,.2f}\n"
-            
-            # Price changes
-            if token_data.get('price_change_24h') is not None:
-                change_24h = token_data['price_change_24h']
-                emoji = "📈" if change_24h > 0 else "📉"
-                message += f"📊 **24h Change:** {emoji} {change_24h:+.2f}%\n"
-            
-            if token_data.get('price_change_1h') is not None:
-                change_1h = token_data['price_change_1h']
-                emoji = "📈" if change_1h > 0 else "📉"
-                message += f"⏰ **1h Change:** {emoji} {change_1h:+.2f}%\n"
+            token_data = await self._cached_token_info(token_identifier)
             
-            if token_data.get('price_change_6h') is not None:
-                change_6h = token_data['price_change_6h']
-                emoji = "📈" if change_6h > 0 else "📉"
-                message += f"⏰ **6h Change:** {emoji} {change_6h:+.2f}%\n"
-            
-            # Trading activity
-            buys_24h = token_data.get('txns_24h_buys', 0)
-            sells_24h = token_data.get('txns_24h_sells', 0)
-            if buys_24h > 0 or sells_24h > 0:
-                message += f"🔄 **24h Transactions:** {buys_24h} buys / {sells_24h} sells\n"
-            
-            # Websites
-            websites = token_data.get('websites', [])
-            if websites:
-                website_links = []
-                for website in websites:
-                    url = website.get('url', '')
-                    label = website.get('label', 'Website')
-                    if url:
-                        website_links.append(f"[{label}]({url})")
-                if website_links:
-                    message += f"🌐 **Websites:** {' | '.join(website_links)}\n"
-            
-            # Social links
-            socials = token_data.get('socials', [])
-            if socials:
-                social_links = []
-                for social in socials:
-                    social_type = social.get('type', '').lower()
-                    social_url = social.get('url', '')
-                    if social_url:
-                        if social_type == 'twitter':
-                            social_links.append(f"[Twitter]({social_url})")
-                        elif social_type == 'telegram':
-                            social_links.append(f"[Telegram]({social_url})")
-                        elif social_type == 'discord':
-                            social_links.append(f"[Discord]({social_url})")
-                        elif social_type == 'website':
-                            social_links.append(f"[Website]({social_url})")
-                        else:
-                            social_links.append(f"[{social_type.capitalize()}]({social_url})")
-                if social_links:
-                    message += f"🌐 **Socials:** {' | '.join(social_links)}\n"
-            
-            # Image URL if available
-            if token_data.get('image_url'):
-                message += f"🖼️ **Image:** [View]({token_data['image_url']})\n"
+            chat_id = _chat_key(update.effective_chat.id)
+            token_ctx = self.user_manager.get_token_context(chat_id, token_data['address'])
+            message = "".join(["📊 **Token Information**\n\n", *token_info_lines(token_data, token_ctx)])
             
             # Create keyboard with copy address button
             keyboard = [
                 [
-                    InlineKeyboardButton("📋 Copy Address", callback_data=f"copy:{token_data['address']}")
+                    _btn("📋 Copy Address", f"copy:{token_data['address']}")
                 ]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -425,16 +556,15 @@ class TelegramHandler:
             return
         
         if not context.args or len(context.args) != 1:
-            await update.message.reply_text("Usage: /remove <token_address>", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(_REMOVE_USAGE, reply_markup=self._main_menu_markup)
             return
         
-        token_address = context.args[0]
-        chat_id = str(update.effective_chat.id)
+        token_address = sys.intern(context.args[0])
+        chat_id = _chat_key(update.effective_chat.id)
         
         # Check if user tracks this token
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        if token_address not in user_tokens:
-            await update.message.reply_text("You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        if not self.user_manager.user_owns_token(chat_id, token_address):
+            await update.message.reply_text("You are not tracking this token.", reply_markup=self._main_menu_markup)
             return
         
         # Remove token for this user
@@ -443,16 +573,10 @@ class TelegramHandler:
         # Check if any other users are tracking this token
         # If not, remove from tracker
         if self.tracker:
-            still_tracked = False
-            for user_id in self.user_manager.get_active_users():
-                if token_address in self.user_manager.get_user_tokens(user_id):
-                    still_tracked = True
-                    break
-            
-            if not still_tracked:
+            if not self.user_manager.other_users_track(token_address, exclude=chat_id):
                 await self.tracker.remove_token(chat_id, token_address)
         
-        await update.message.reply_text(f"✅ Removed token from your tracking list", parse_mode='HTML', reply_markup=self.get_main_menu_keyboard())
+        await update.message.reply_text(f"✅ Removed token from your tracking list", parse_mode='HTML', reply_markup=self._main_menu_markup)
     
     async def reset_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Reset price reference for a token: /reset <token_address>"""
@@ -461,57 +585,61 @@ class TelegramHandler:
         
         if not context.args or len(context.args) != 1:
             await update.message.reply_text(
-                "Usage: /reset <token_address>\n\n"
-                "This will reset the price reference to the current price.\n"
-                "Future alerts will use this new price as the baseline.\n\n"
-                "Example: `/reset 6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump`",
+                _RESET_USAGE,
                 parse_mode='Markdown',
-                reply_markup=self.get_main_menu_keyboard()
+                reply_markup=self._main_menu_markup
             )
             return
         
-        token_address = context.args[0]
-        chat_id = str(update.effective_chat.id)
+        token_address = sys.intern(context.args[0])
+        chat_id = _chat_key(update.effective_chat.id)
         
         if not self.tracker:
-            await update.message.reply_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Tracker not available.", reply_markup=self._main_menu_markup)
             return
         
         # Check if user tracks this token
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        if token_address not in user_tokens:
-            await update.message.reply_text(f"You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        if not self.user_manager.user_owns_token(chat_id, token_address):
+            await update.message.reply_text(f"You are not tracking this token.", reply_markup=self._main_menu_markup)
             return
         
+        pending = await update.message.reply_text("⏳ Resetting price reference...")
+        
         try:
             # Reset price reference for this user
             new_price = await self.tracker.reset_price_reference(chat_id, token_address)
-            short_token = f"{token_address[:8]}...{token_address[-8:]}"
-            await update.message.reply_text(
+            short_token = _shortaddr(token_address)
+            await pending.edit_text(
                 f"✅ **Price Reference Reset**\n\n"
                 f"Token: {short_token}\n"
-                f"New reference price: ${new_price:.8f}\n\n"
+                f"New reference price: {PRICE(new_price)}\n\n"
                 f"Your future alerts will use this as the baseline price.",
                 parse_mode='Markdown',
-                reply_markup=self.get_main_menu_keyboard()
+                reply_markup=self._main_menu_markup
             )
         except Exception as e:
-            await update.message.reply_text(f"❌ Error resetting price reference: {str(e)}", reply_markup=self.get_main_menu_keyboard())
+            await pending.edit_text(f"❌ Error resetting price reference: {str(e)}", reply_markup=self._main_menu_markup)
     
     async def stop_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         
         # Deactivate user
         self.user_manager.deactivate_user(chat_id)
         
-        await update.message.reply_text("You have been unsubscribed from alerts. Send /start to subscribe again.", reply_markup=self.get_main_menu_keyboard())
+        await update.message.reply_text("You have been unsubscribed from alerts. Send /start to subscribe again.", reply_markup=self._main_menu_markup)
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle button presses"""
         query = update.callback_query
+        callback_data = query.data
+        
+        # Copy answers the query itself with an alert, so it must not be pre-answered
+        if callback_data.startswith("copy:"):
+            await self._handle_copy_address(query, context, callback_data.split(":", 1)[1])
+            return
+        
         await query.answer()
         
-        callback_data = query.data
         
         if callback_data == "status":
             await self._handle_status_button(query, context)
@@ -533,6 +661,12 @@ class TelegramHandler:
             await self._handle_reset_price_button(query, context)
         elif callback_data == "help":
             await self._handle_help_button(query, context)
+        elif callback_data.startswith("remove_page:"):
+            await self._handle_remove_token_button(query, context, int(callback_data.split(":", 1)[1]))
+        elif callback_data.startswith("reset_page:"):
+            await self._handle_reset_price_button(query, context, int(callback_data.split(":", 1)[1]))
+        elif callback_data.startswith("get_page:"):
+            await self._handle_get_token_button(query, context, int(callback_data.split(":", 1)[1]))
         elif callback_data.startswith("remove:"):
             token_address = callback_data.split(":", 1)[1]
             await self._handle_remove_specific_token(query, context, token_address)
@@ -545,9 +679,6 @@ class TelegramHandler:
         elif callback_data.startswith("reset_price:"):
             token_address = callback_data.split(":", 1)[1]
             await self._handle_reset_price_specific(query, context, token_address)
-        elif callback_data.startswith("copy:"):
-            token_address = callback_data.split(":", 1)[1]
-            await self._handle_copy_address(query, context, token_address)
         elif callback_data.startswith("show_token:"):
             token_address = callback_data.split(":", 1)[1]
             await self._handle_show_token_info(query, context, token_address)
@@ -565,11 +696,11 @@ class TelegramHandler:
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_data = self.user_manager.get_user(chat_id)
         
         if not user_data:
-            await query.edit_message_text("User not found. Please send /start first.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "User not found. Please send /start first.")
             return
         
         # Get user's tokens count
@@ -578,103 +709,84 @@ class TelegramHandler:
         status_message = (
             f"🟢 Bot Status: Active\n\n"
             f"Your Settings:\n"
-            f"• Price Threshold: {user_data['global_threshold']}%\n"
+            f"• Price Threshold: {user_data.global_threshold}%\n"
             f"• Tracked Tokens: {len(user_tokens)}\n"
-            f"• Alerts: {'Enabled' if user_data['active'] else 'Disabled'}\n\n"
+            f"• Alerts: {'Enabled' if user_data.active else 'Disabled'}\n\n"
             f"Global Settings:\n"
-            f"• Check Interval: {config.check_interval}s\n"
+            f"• Check Interval: {get_config().check_interval}s\n"
         )
         
-        await query.edit_message_text(status_message, reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, status_message)
     
     async def _handle_tokens_button(self, query, context):
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         if not user_tokens:
-            await query.edit_message_text("You are not tracking any tokens.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "You are not tracking any tokens.")
             return
         
+        user_global_threshold = self.user_manager.get_user_threshold(chat_id)['value']
+        token_displays = await self._resolve_token_displays(user_tokens)
+        
         message = "📊 Your Tracked Tokens:\n\n"
-        for i, token_address in enumerate(user_tokens, 1):
+        for i, (token_address, token_display) in enumerate(zip(user_tokens, token_displays), 1):
             threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
             threshold = threshold_config['value']
             direction = threshold_config.get('direction', 'both')
-            user_global_threshold = self.user_manager.get_user_threshold(chat_id)['value']
-            
-            direction_emoji = {
-                'both': '📊',
-                'positive': '📈',
-                'negative': '📉'
-            }.get(direction, '📊')
             
-            # Get token name/symbol for display
-            if self.tracker:
-                try:
-                    token_info = await self.tracker.get_token_info_with_timestamp(token_address)
-                    token_display = f"${token_info['symbol']}"
-                except:
-                    # Fallback to shortened address if token info unavailable
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
+            direction_emoji = _DIRECTION_EMOJI.get(direction, '📊')
             
             if threshold == user_global_threshold and direction == 'both':
                 message += f"{i}. <code>{token_display}</code> {direction_emoji} (Your Default: {threshold}%)\n"
             else:
                 message += f"{i}. <code>{token_display}</code> {direction_emoji} (Custom: {threshold}% {direction})\n"
         
-        await query.edit_message_text(message, parse_mode='HTML', reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, message, parse_mode='HTML')
     
     async def _handle_add_token_button(self, query, context):
         if not await self._is_authorized_query(query):
             return
         
-        await query.edit_message_text(
-            "To add a token, send me the token address.\n\n"
-            "Format: <code>token_address</code>\n"
-            "Example: <code>6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump</code>",
-            parse_mode='HTML',
-            reply_markup=self.get_main_menu_keyboard()
+        await self._reply(
+            query,
+            _ADD_TOKEN_INSTRUCTIONS,
+            parse_mode='HTML'
         )
     
-    async def _handle_remove_token_button(self, query, context):
+    async def _handle_remove_token_button(self, query, context, page: int = 0):
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         if not user_tokens:
-            await query.edit_message_text("You are not tracking any tokens.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "You are not tracking any tokens.")
             return
         
         # Create buttons for each token to remove
         keyboard = []
-        for token_address in user_tokens[:10]:  # Limit to 10 tokens
-            if self.tracker:
-                try:
-                    token_data = await self.tracker.get_token_info_with_timestamp(token_address)
-                    token_display = f"${token_data['symbol']}"
-                except:
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            keyboard.append([InlineKeyboardButton(f"❌ {token_display}", callback_data=f"remove:{token_address}")])
-        
-        keyboard.append([InlineKeyboardButton("« Back", callback_data="back_to_main")])
+        token_addresses, nav_row = self._paginate(user_tokens, page, "remove_page")
+        token_displays = await self._resolve_token_displays(token_addresses)
+        for token_address, token_display in zip(token_addresses, token_displays):
+            keyboard.append([_btn(f"❌ {token_display}", f"remove:{token_address}")])
+        
+        if nav_row:
+            keyboard.append(nav_row)
+        keyboard.append([_btn("« Back", "back_to_main")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text("Select a token to remove:", reply_markup=reply_markup)
+        await self._reply(query, "Select a token to remove:", markup=reply_markup)
     
-    async def _handle_get_token_button(self, query, context):
+    async def _handle_get_token_button(self, query, context, page: int = 0):
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         message = "📈 **Get Token Info**\n\n"
@@ -683,69 +795,59 @@ class TelegramHandler:
             message += "**Your Tracked Tokens:**\n"
             keyboard = []
             
-            # Add buttons for user's tracked tokens (limit to 10)
-            for token_address in list(user_tokens)[:10]:
-                if self.tracker:
-                    try:
-                        token_data = await self.tracker.get_token_info_with_timestamp(token_address)
-                        token_display = f"{token_data['symbol']}"
-                    except:
-                        token_display = f"{token_address[:8]}...{token_address[-8:]}"
-                else:
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-                
-                keyboard.append([InlineKeyboardButton(f"📊 {token_display}", callback_data=f"show_token:{token_address}")])
+            # Add buttons for one page of the user's tracked tokens
+            token_addresses, nav_row = self._paginate(user_tokens, page, "get_page")
+            token_displays = await self._resolve_token_displays(token_addresses, prefix="")
+            for token_address, token_display in zip(token_addresses, token_displays):
+                keyboard.append([_btn(f"📊 {token_display}", f"show_token:{token_address}")])
+            
+            if nav_row:
+                keyboard.append(nav_row)
             
             # Add separator and instructions
-            keyboard.append([InlineKeyboardButton("─────────────", callback_data="separator")])
+            keyboard.append([_btn("─────────────", "separator")])
             message += "\nClick a token above to see its info, or send:\n\n"
         else:
             message += "You have no tracked tokens yet.\n\n"
             message += "To get token info, send me:\n\n"
             keyboard = []
         
-        message += "• Token name: <code>MASK</code>\n"
-        message += "• Token symbol: <code>catwifmask</code>\n"
-        message += "• Token address: <code>6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump</code>"
+        message += _GET_TOKEN_EXAMPLES
         
         # Add back button
-        keyboard.append([InlineKeyboardButton("« Back to Main Menu", callback_data="back_to_main")])
+        keyboard.append([_btn("« Back to Main Menu", "back_to_main")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(message, parse_mode='HTML', reply_markup=reply_markup)
+        await self._reply(query, message, parse_mode='HTML', markup=reply_markup)
     
     async def _handle_set_threshold_button(self, query, context):
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_threshold = self.user_manager.get_user_threshold(chat_id)['value']
         
-        await query.edit_message_text(
-            "To set a new price threshold, send me a number.\n\n"
-            f"Your current threshold: {user_threshold}%\n"
-            "Example: <code>15</code> (for 15%)",
-            parse_mode='HTML',
-            reply_markup=self.get_main_menu_keyboard()
+        await self._reply(
+            query,
+            _SET_THRESHOLD_PROMPT.format(threshold=user_threshold),
+            parse_mode='HTML'
         )
     
     async def _handle_stop_alerts_button(self, query, context):
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         
         # Deactivate user
         self.user_manager.deactivate_user(chat_id)
         
-        await query.edit_message_text("You have been unsubscribed from alerts. Send /start to subscribe again.", reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, "You have been unsubscribed from alerts. Send /start to subscribe again.")
     
     async def _handle_remove_specific_token(self, query, context, token_address):
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        
-        if token_address not in user_tokens:
-            await query.edit_message_text("You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        chat_id = _chat_key(query.from_user.id)
+        if not self.user_manager.user_owns_token(chat_id, token_address):
+            await self._reply(query, "You are not tracking this token.")
             return
         
         # Remove token for this user
@@ -753,29 +855,23 @@ class TelegramHandler:
         
         # Check if any other users are tracking this token
         if self.tracker:
-            still_tracked = False
-            for user_id in self.user_manager.get_active_users():
-                if token_address in self.user_manager.get_user_tokens(user_id):
-                    still_tracked = True
-                    break
-            
-            if not still_tracked:
+            if not self.user_manager.other_users_track(token_address, exclude=chat_id):
                 await self.tracker.remove_token(chat_id, token_address)
         
         if self.tracker:
             try:
-                token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+                token_data = await self._cached_token_info(token_address)
                 token_display = f"${token_data['symbol']}"
             except:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
+                token_display = _shortaddr(token_address)
         else:
-            token_display = f"{token_address[:8]}...{token_address[-8:]}"
+            token_display = _shortaddr(token_address)
         
-        await query.edit_message_text(f"✅ Removed token: {token_display}", reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, f"✅ Removed token: {token_display}")
     
     async def _handle_back_to_main(self, query, context):
         # Recreate main menu
-        await query.edit_message_text("🏠 Main Menu - Use the buttons below or type commands:", reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, "🏠 Main Menu - Use the buttons below or type commands:")
     
     async def _handle_track_token(self, query, context, token_address):
         """Handle tracking a token from inline button"""
@@ -783,29 +879,31 @@ class TelegramHandler:
             return
         
         if not self.tracker:
-            await query.edit_message_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "Tracker not available.")
             return
         
-        chat_id = str(query.from_user.id)
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        
-        if token_address in user_tokens:
-            await query.edit_message_text("You are already tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        chat_id = _chat_key(query.from_user.id)
+        if self.user_manager.user_owns_token(chat_id, token_address):
+            await self._reply(query, "You are already tracking this token.")
             return
         
-        # Add token via tracker (handles entry price automatically)
-        if self.tracker:
-            await self.tracker.add_token(chat_id, token_address)
-        else:
-            # Fallback if tracker not available
-            self.user_manager.add_token_to_user(chat_id, token_address)
+        try:
+            # Add token via tracker (handles entry price automatically)
+            if self.tracker:
+                await self.tracker.add_token(chat_id, token_address)
+            else:
+                # Fallback if tracker not available
+                self.user_manager.add_token_to_user(chat_id, token_address)
+        except Exception as e:
+            await self._reply(query, f"❌ Error adding token: {str(e)}")
+            return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+            token_data = await self._cached_token_info(token_address)
             token_display = f"${token_data['symbol']}"
         except:
-            token_display = f"{token_address[:8]}...{token_address[-8:]}"
-        await query.edit_message_text(f"✅ Now tracking token: {token_display}", reply_markup=self.get_main_menu_keyboard())
+            token_display = _shortaddr(token_address)
+        await self._reply(query, f"✅ Now tracking token: {token_display}")
     
     async def _handle_refresh_token(self, query, context, token_address):
         """Handle refreshing token info from inline button"""
@@ -813,206 +911,98 @@ class TelegramHandler:
             return
         
         if not self.tracker:
-            await query.edit_message_text("Tracker not available.")
+            await self._reply(query, "Tracker not available.")
             return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(token_address)
-            
-            # Format refreshed message with only requested variables
-            chat_id = str(query.from_user.id)
-            message = f"🔄 **Refreshed Token Info**\n\n"
-            message += f"🏷️ **Name:** {token_data['name']}\n"
-            message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-            message += f"🔗 **Address:** `{token_data['address']}`\n"
-            message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-            
-            # Check if user is tracking this token and show entry performance
-            user_tokens = self.user_manager.get_user_tokens(chat_id)
-            if token_data['address'] in user_tokens:
-                entry_price = self.user_manager.get_entry_price(chat_id, token_data['address'])
-                if entry_price:
-                    price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                    emoji = "📈" if price_change > 0 else "📉"
-                    message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                    message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-                message += f"🎯 **You're tracking this token**\n"
-            
-            message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-            message += f"📊 **24h Volume:** ${token_data.get('volume_24h', 0):,.2f}\n"
-            
-            # Volume 1h and 6h if available
-            if token_data.get('volume_1h', 0) > 0:
-                message += f"📊 **1h Volume:** ${token_data['volume_1h']:,.2f}\n"
-            if token_data.get('volume_6h', 0) > 0:
-                message += f"📊 **6h Volume:** ${token_data['volume_6h']:,.2f}\n"
-            
-            # Price changes
-            if token_data.get('price_change_24h') is not None:
-                change_24h = token_data['price_change_24h']
-                emoji = "📈" if change_24h > 0 else "📉"
-                message += f"📊 **24h Change:** {emoji} {change_24h:+.2f}%\n"
-            
-            if token_data.get('price_change_1h') is not None:
-                change_1h = token_data['price_change_1h']
-                emoji = "📈" if change_1h > 0 else "📉"
-                message += f"⏰ **1h Change:** {emoji} {change_1h:+.2f}%\n"
-            
-            if token_data.get('price_change_6h') is not None:
-                change_6h = token_data['price_change_6h']
-                emoji = "📈" if change_6h > 0 else "📉"
-                message += f"⏰ **6h Change:** {emoji} {change_6h:+.2f}%\n"
+            token_data = await self._cached_token_info(token_address, fresh=True)
             
-            # Trading activity
-            buys_24h = token_data.get('txns_24h_buys', 0)
-            sells_24h = token_data.get('txns_24h_sells', 0)
-            if buys_24h > 0 or sells_24h > 0:
-                message += f"🔄 **24h Transactions:** {buys_24h} buys / {sells_24h} sells\n"
-            
-            # Websites
-            websites = token_data.get('websites', [])
-            if websites:
-                website_links = []
-                for website in websites:
-                    url = website.get('url', '')
-                    label = website.get('label', 'Website')
-                    if url:
-                        website_links.append(f"[{label}]({url})")
-                if website_links:
-                    message += f"🌐 **Websites:** {' | '.join(website_links)}\n"
-            
-            # Social links
-            socials = token_data.get('socials', [])
-            if socials:
-                social_links = []
-                for social in socials:
-                    social_type = social.get('type', '').lower()
-                    social_url = social.get('url', '')
-                    if social_url:
-                        if social_type == 'twitter':
-                            social_links.append(f"[Twitter]({social_url})")
-                        elif social_type == 'telegram':
-                            social_links.append(f"[Telegram]({social_url})")
-                        elif social_type == 'discord':
-                            social_links.append(f"[Discord]({social_url})")
-                        elif social_type == 'website':
-                            social_links.append(f"[Website]({social_url})")
-                        else:
-                            social_links.append(f"[{social_type.capitalize()}]({social_url})")
-                if social_links:
-                    message += f"🌐 **Socials:** {' | '.join(social_links)}\n"
-            
-            # Image URL if available
-            if token_data.get('image_url'):
-                message += f"🖼️ **Image:** [View]({token_data['image_url']})\n"
-            
-            message += f"\n🕐 **Updated:** {token_data['fetched_timestamp']}"
+            chat_id = _chat_key(query.from_user.id)
+            token_ctx = self.user_manager.get_token_context(chat_id, token_data['address'])
+            parts = ["🔄 **Refreshed Token Info**\n\n", *token_info_lines(token_data, token_ctx)]
+            parts.append(f"\n🕐 **Updated:** {token_data['fetched_timestamp']}")
             
             # Update keyboard
             keyboard = [
                 [
-                    InlineKeyboardButton("➕ Track This", callback_data=f"track:{token_address}"),
-                    InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh:{token_address}")
+                    _btn("➕ Track This", f"track:{token_address}"),
+                    _btn("🔄 Refresh", f"refresh:{token_address}")
                 ],
                 [
-                    InlineKeyboardButton("📋 Copy Address", callback_data=f"copy:{token_address}")
+                    _btn("📋 Copy Address", f"copy:{token_address}")
                 ],
                 [
-                    InlineKeyboardButton("📈 Main Menu", callback_data="back_to_main")
+                    _btn("📈 Main Menu", "back_to_main")
                 ]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+            message = "".join(parts)
+            await self._throttled_edit(query, message, parse_mode='Markdown', reply_markup=reply_markup)
             
         except Exception as e:
-            await query.edit_message_text(f"❌ Error refreshing token data: {str(e)}", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, f"❌ Error refreshing token data: {str(e)}")
     
     async def _handle_recap_button(self, query, context):
         """Handle recap button press"""
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_data = self.user_manager.get_user(chat_id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         if not user_tokens:
-            await query.edit_message_text("📊 Recap: You are not tracking any tokens.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "📊 Recap: You are not tracking any tokens.")
             return
         
         recap_message = f"📊 **Your Daily Recap**\n\n"
         recap_message += f"**Your Tracked Tokens:** {len(user_tokens)}\n"
-        recap_message += f"**Your Price Threshold:** {user_data['global_threshold']}%\n"
-        recap_message += f"**Alerts Status:** {'Enabled' if user_data['active'] else 'Disabled'}\n\n"
+        recap_message += f"**Your Price Threshold:** {user_data.global_threshold}%\n"
+        recap_message += f"**Alerts Status:** {'Enabled' if user_data.active else 'Disabled'}\n\n"
         recap_message += "**Your Recent Tokens:**\n"
         
-        for i, token_address in enumerate(list(user_tokens)[:5], 1):
+        recent_tokens = list(user_tokens)[:5]
+        token_displays = await self._resolve_token_displays(recent_tokens)
+        for i, (token_address, token_display) in enumerate(zip(recent_tokens, token_displays), 1):
             threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
             threshold = threshold_config['value']
             direction = threshold_config.get('direction', 'both')
             
-            direction_emoji = {
-                'both': '📊',
-                'positive': '📈',
-                'negative': '📉'
-            }.get(direction, '📊')
-            
-            # Get token name/symbol for display
-            if self.tracker:
-                try:
-                    token_info = await self.tracker.get_token_info_with_timestamp(token_address)
-                    token_display = f"${token_info['symbol']}"
-                except:
-                    # Fallback to shortened address if token info unavailable
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
+            direction_emoji = _DIRECTION_EMOJI.get(direction, '📊')
             
             recap_message += f"{i}. `{token_display}` {direction_emoji} ({threshold}%)\n"
         
         if len(user_tokens) > 5:
             recap_message += f"... and {len(user_tokens) - 5} more tokens\n"
         
-        await query.edit_message_text(recap_message, parse_mode='Markdown', reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, recap_message, parse_mode='Markdown')
     
-    async def _handle_reset_price_button(self, query, context):
+    async def _handle_reset_price_button(self, query, context, page: int = 0):
         """Handle reset price button press"""
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_tokens = self.user_manager.get_user_tokens(chat_id)
         
         if not user_tokens:
-            await query.edit_message_text("You are not tracking any tokens.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "You are not tracking any tokens.")
             return
         
         # Create buttons for each token to reset price
         keyboard = []
-        for token_address in user_tokens[:10]:  # Limit to 10 tokens
-            if self.tracker:
-                try:
-                    token_data = await self.tracker.get_token_info_with_timestamp(token_address)
-                    token_display = f"${token_data['symbol']}"
-                except:
-                    token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            else:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            keyboard.append([InlineKeyboardButton(f"🔄 {token_display}", callback_data=f"reset_price:{token_address}")])
-        
-        keyboard.append([InlineKeyboardButton("« Back", callback_data="back_to_main")])
+        token_addresses, nav_row = self._paginate(user_tokens, page, "reset_page")
+        token_displays = await self._resolve_token_displays(token_addresses)
+        for token_address, token_display in zip(token_addresses, token_displays):
+            keyboard.append([_btn(f"🔄 {token_display}", f"reset_price:{token_address}")])
+        
+        if nav_row:
+            keyboard.append(nav_row)
+        keyboard.append([_btn("« Back", "back_to_main")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(
-            "🔄 **Reset Price Reference**\n\n"
-            "Select a token to reset its price reference to the current price. "
-            "Future alerts will use this new price as the baseline.\n\n"
-            "Select a token:",
-            parse_mode='Markdown',
-            reply_markup=reply_markup
-        )
+        await self._reply(query, _RESET_PRICE_HEADER, parse_mode='Markdown', markup=reply_markup)
     
     async def _handle_reset_price_specific(self, query, context, token_address):
         """Handle resetting price reference for a specific token"""
@@ -1020,38 +1010,38 @@ class TelegramHandler:
             return
         
         if not self.tracker:
-            await query.edit_message_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "Tracker not available.")
             return
         
-        chat_id = str(query.from_user.id)
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        
-        if token_address not in user_tokens:
-            await query.edit_message_text("You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        chat_id = _chat_key(query.from_user.id)
+        if not self.user_manager.user_owns_token(chat_id, token_address):
+            await self._reply(query, "You are not tracking this token.")
             return
         
         try:
             new_price = await self.tracker.reset_price_reference(chat_id, token_address)
+            self._invalidate_token_info(token_address)
             try:
-                token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+                token_data = await self._cached_token_info(token_address)
                 token_display = f"${token_data['symbol']}"
             except:
-                token_display = f"{token_address[:8]}...{token_address[-8:]}"
-            await query.edit_message_text(
+                token_display = _shortaddr(token_address)
+            await self._throttled_edit(
+                query,
                 f"✅ **Price Reference Reset**\n\n"
                 f"Token: {token_display}\n"
-                f"New reference price: ${new_price:.8f}\n\n"
+                f"New reference price: {PRICE(new_price)}\n\n"
                 f"Your future alerts will use this as the baseline price.",
                 parse_mode='Markdown',
-                reply_markup=self.get_main_menu_keyboard()
+                reply_markup=self._main_menu_markup
             )
         except Exception as e:
-            await query.edit_message_text(f"❌ Error resetting price reference: {str(e)}", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, f"❌ Error resetting price reference: {str(e)}")
     
     async def _handle_copy_address(self, query, context, token_address):
         """Handle copy address button press"""
-        if not await self._is_authorized_query(query):
-            return
+        # No auth check: the address is already in the button's callback data, and
+        # the alert has to go out before Telegram's answer deadline
         
         # Unfortunately, Telegram bots cannot directly copy to clipboard
         # But we can show the address in a way that's easy to copy
@@ -1065,45 +1055,7 @@ class TelegramHandler:
         if not await self._is_authorized_query(query):
             return
         
-        help_message = (
-            "❓ **Help - Crypto Trading Bot**\n\n"
-            "**Commands:**\n"
-            "• `/start` - Initialize the bot and show menu\n"
-            "• `/status` - Show your bot status and settings\n"
-            "• `/tokens` - List your tracked tokens\n"
-            "• `/add <address>` - Add a token to track\n"
-            "• `/remove <address>` - Remove a token\n"
-            "• `/get <name/symbol/address>` - Get token info\n"
-            "• `/threshold <number>` - Set your global price threshold\n"
-            "• `/setthreshold <address> <threshold> [direction]` - Set custom token threshold\n"
-            "• `/reset <address>` - Reset price reference to current price\n"
-            "• `/stop` - Stop receiving alerts\n\n"
-            "**Buttons:**\n"
-            "• 📊 **Status** - View your bot status\n"
-            "• 🪙 **Tokens** - View your tracked tokens\n"
-            "• ➕ **Add Token** - Instructions to add tokens\n"
-            "• ➖ **Remove Token** - Select tokens to remove\n"
-            "• 📈 **Get Token Info** - Instructions for token lookup\n"
-            "• ⚙️ **Set Threshold** - Instructions to set price threshold\n"
-            "• 🔄 **Reset Price** - Reset price reference for tokens\n"
-            "• 📊 **Recap** - Summary of your tracked tokens\n"
-            "• ❓ **Help** - This help message\n"
-            "• ❌ **Stop Alerts** - Unsubscribe from notifications\n\n"
-            "**Tips:**\n"
-            "• Send a token address directly to track it\n"
-            "• Send a number (1-100) to set price threshold\n"
-            "• Send a token name/symbol to get info\n"
-            "• Use custom thresholds for specific tokens\n"
-            "• Set direction to 'positive', 'negative', or 'both'\n"
-            "• Reset price reference to start fresh tracking\n"
-            "• Each user has their own tracking list and settings\n\n"
-            "**Examples:**\n"
-            "• `6MQpbiTC2YcogidTmKqMLK82qvE9z5QEm7EP3AEDpump`\n"
-            "• `15` (sets 15% threshold)\n"
-            "• `MASK` or `catwifmask`"
-        )
-        
-        await query.edit_message_text(help_message, parse_mode='Markdown', reply_markup=self.get_main_menu_keyboard())
+        await self._reply(query, _HELP_MESSAGE, parse_mode='Markdown')
     
     async def _handle_show_token_info(self, query, context, token_address):
         """Handle showing token info for user's tracked token"""
@@ -1111,102 +1063,79 @@ class TelegramHandler:
             return
         
         if not self.tracker:
-            await query.edit_message_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, "Tracker not available.")
             return
         
-        chat_id = str(query.from_user.id)
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        
-        if token_address not in user_tokens:
-            await query.edit_message_text("You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        chat_id = _chat_key(query.from_user.id)
+        token_ctx = self.user_manager.get_token_context(chat_id, token_address)
+        if not token_ctx['tracked']:
+            await self._reply(query, "You are not tracking this token.")
             return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+            token_data = await self._cached_token_info(token_address)
             
             # Get user's tracking info
-            threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
-            entry_price = self.user_manager.get_entry_price(chat_id, token_address)
-            
-            # Format message with tracking status
-            message = f"📊 **Token Information** (Tracking)\n\n"
-            message += f"🏷️ **Name:** {token_data['name']}\n"
-            message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-            message += f"🔗 **Address:** `{token_address}`\n"
-            message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-            
-            # Show P&L if entry price available
-            if entry_price:
-                price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                emoji = "📈" if price_change > 0 else "📉"
-                message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-            
-            message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-            message += f"📊 **24h Volume:** ${token_data.get('volume_24h', 0):,.2f}\n"
+            threshold_config = token_ctx['threshold']
+            entry_price = token_ctx['entry_price']
             
-            # Price changes
-            if token_data.get('price_change_24h') is not None:
-                change_24h = token_data['price_change_24h']
-                emoji = "📈" if change_24h > 0 else "📉"
-                message += f"📊 **24h Change:** {emoji} {change_24h:+.2f}%\n"
+            # Format message with tracking status; the compact view skips the optional volumes and 6h change
+            parts = [f"📊 **Token Information** (Tracking)\n\n"]
+            parts += render_fields(token_data, INFO_FIELDS)
+            parts += entry_lines(token_data['price'], entry_price)
+            parts += render_fields(token_data, MARKET_FIELDS[:3])
+            parts += change_lines(token_data, CHANGE_FIELDS[:2])
             
-            if token_data.get('price_change_1h') is not None:
-                change_1h = token_data['price_change_1h']
-                emoji = "📈" if change_1h > 0 else "📉"
-                message += f"⏰ **1h Change:** {emoji} {change_1h:+.2f}%\n"
-            
-            message += f"\n🎯 **Your Alert Settings:**\n"
-            message += f"📊 **Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n"
-            message += f"🕐 **Updated:** {token_data['fetched_timestamp']}"
+            parts.append(f"\n🎯 **Your Alert Settings:**\n")
+            parts.append(f"📊 **Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n")
+            parts.append(f"🕐 **Updated:** {token_data['fetched_timestamp']}")
             
             # Create action buttons
             keyboard = [
                 [
-                    InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh:{token_address}"),
-                    InlineKeyboardButton("🔄 Reset Price", callback_data=f"reset_price:{token_address}")
+                    _btn("🔄 Refresh", f"refresh:{token_address}"),
+                    _btn("🔄 Reset Price", f"reset_price:{token_address}")
                 ],
                 [
-                    InlineKeyboardButton("⚙️ Set Threshold", callback_data=f"set_threshold:{token_address}"),
-                    InlineKeyboardButton("❌ Remove", callback_data=f"remove:{token_address}")
+                    _btn("⚙️ Set Threshold", f"set_threshold:{token_address}"),
+                    _btn("❌ Remove", f"remove:{token_address}")
                 ],
                 [
-                    InlineKeyboardButton("📋 Copy Address", callback_data=f"copy:{token_address}")
+                    _btn("📋 Copy Address", f"copy:{token_address}")
                 ],
                 [
-                    InlineKeyboardButton("« Back", callback_data="get_token"),
-                    InlineKeyboardButton("🏠 Main Menu", callback_data="back_to_main")
+                    _btn("« Back", "get_token"),
+                    _btn("🏠 Main Menu", "back_to_main")
                 ]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(message, parse_mode='Markdown', disable_web_page_preview=True, reply_markup=reply_markup)
+            message = "".join(parts)
+            await self._reply(query, message, parse_mode='Markdown', markup=reply_markup, disable_web_page_preview=True)
             
         except Exception as e:
-            await query.edit_message_text(f"❌ Error getting token info: {str(e)}", reply_markup=self.get_main_menu_keyboard())
+            await self._reply(query, f"❌ Error getting token info: {str(e)}")
     
     async def _handle_set_threshold_specific(self, query, context, token_address):
         """Handle setting threshold for a specific token via button"""
         if not await self._is_authorized_query(query):
             return
         
-        chat_id = str(query.from_user.id)
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        
-        if token_address not in user_tokens:
-            await query.edit_message_text("You are not tracking this token.", reply_markup=self.get_main_menu_keyboard())
+        chat_id = _chat_key(query.from_user.id)
+        if not self.user_manager.user_owns_token(chat_id, token_address):
+            await self._reply(query, "You are not tracking this token.")
             return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(token_address)
+            token_data = await self._cached_token_info(token_address)
             token_display = f"{token_data['symbol']}"
         except:
-            token_display = f"{token_address[:8]}...{token_address[-8:]}"
+            token_display = _shortaddr(token_address)
         
         current_threshold = self.user_manager.get_user_threshold(chat_id, token_address)
         
-        await query.edit_message_text(
+        await self._reply(
+            query,
             f"⚙️ **Set Threshold for {token_display}**\n\n"
             f"Current threshold: {current_threshold['value']}% ({current_threshold['direction']})\n\n"
             f"To set a new threshold, use the command:\n"
@@ -1216,7 +1145,7 @@ class TelegramHandler:
             f"• `/setthreshold {token_address} 15 positive` (15% only up)\n"
             f"• `/setthreshold {token_address} 10 negative` (10% only down)",
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("« Back", callback_data=f"show_token:{token_address}")]])
+            markup=InlineKeyboardMarkup([[_btn("« Back", f"show_token:{token_address}")]])
         )
     
     async def handle_text_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1227,9 +1156,9 @@ class TelegramHandler:
         text = update.message.text.strip()
         
         # Check if it looks like a Solana token address (base58, ~44 chars)
-        if len(text) >= 32 and len(text) <= 44 and re.match(r'^[1-9A-HJ-NP-Za-km-z]+$', text):
+        if SOLANA_ADDR_RE.match(text):
             # Handle token address
-            await self._handle_token_address(update, text)
+            await self._handle_token_address(update, sys.intern(text))
         else:
             # Try to parse as threshold
             try:
@@ -1245,46 +1174,22 @@ class TelegramHandler:
     async def _handle_token_address(self, update: Update, token_address: str):
         """Handle when user sends a token address"""
         if not self.tracker:
-            await update.message.reply_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Tracker not available.", reply_markup=self._main_menu_markup)
             return
         
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         
-        # Check if already tracking
-        user_tokens = self.user_manager.get_user_tokens(chat_id)
-        if token_address in user_tokens:
+        # Check if user already tracks this token
+        token_ctx = self.user_manager.get_token_context(chat_id, token_address)
+        if token_ctx['tracked']:
             # Show token info instead of error
             try:
-                token_data = await self.tracker.get_token_info_with_timestamp(token_address)
-                
-                # Get user's threshold for this token
-                threshold_config = self.user_manager.get_user_threshold(chat_id, token_address)
-                entry_price = self.user_manager.get_entry_price(chat_id, token_address)
+                token_data = await self._cached_token_info(token_address)
                 
-                message = f"ℹ️ **Already Tracking This Token**\n\n"
-                message += f"🏷️ **Name:** {token_data['name']}\n"
-                message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-                message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-                if entry_price:
-                    price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                    emoji = "📈" if price_change > 0 else "📉"
-                    message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                    message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-                message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-                message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-                message += f"🎯 **Your Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n"
+                message = _already_tracking_text(token_data, token_ctx['threshold'], token_ctx['entry_price'])
                 
                 # Add action buttons
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🔄 Reset Price Reference", callback_data=f"reset_price:{token_address}"),
-                        InlineKeyboardButton("⚙️ Set Threshold", callback_data=f"set_threshold:{token_address}")
-                    ],
-                    [
-                        InlineKeyboardButton("❌ Remove Token", callback_data=f"remove:{token_address}")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+                reply_markup = _tracked_token_markup(token_address)
                 
                 await update.message.reply_text(message, parse_mode='Markdown', reply_markup=reply_markup)
                 return
@@ -1294,20 +1199,27 @@ class TelegramHandler:
                     f"⚠️ You are already tracking this token.\n\n"
                     f"Address: <code>{token_address}</code>",
                     parse_mode='HTML',
-                    reply_markup=self.get_main_menu_keyboard()
+                    reply_markup=self._main_menu_markup
                 )
                 return
         
-        # Add token via tracker (handles entry price automatically)
-        if self.tracker:
-            await self.tracker.add_token(chat_id, token_address)
-        else:
-            # Fallback if tracker not available
-            self.user_manager.add_token_to_user(chat_id, token_address)
+        # Acknowledge right away so the user isn't left waiting on the DexScreener round-trip
+        pending = await update.message.reply_text("⏳ Adding token...")
+        
+        try:
+            # Add token via tracker (handles entry price automatically)
+            if self.tracker:
+                await self.tracker.add_token(chat_id, token_address)
+            else:
+                # Fallback if tracker not available
+                self.user_manager.add_token_to_user(chat_id, token_address)
+        except Exception as e:
+            await pending.edit_text(f"❌ Error adding token: {str(e)}", reply_markup=self._main_menu_markup)
+            return
         
-        reply_markup = self.get_main_menu_keyboard()
+        reply_markup = self._main_menu_markup
         
-        await update.message.reply_text(
+        await pending.edit_text(
             f"✅ Token added to your tracking list!\n\n"
             f"Use the buttons below for more actions:",
             reply_markup=reply_markup
@@ -1315,10 +1227,10 @@ class TelegramHandler:
     
     async def _handle_threshold_value(self, update: Update, threshold: float):
         """Handle when user sends a threshold value"""
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         self.user_manager.set_user_global_threshold(chat_id, threshold)
         
-        reply_markup = self.get_main_menu_keyboard()
+        reply_markup = self._main_menu_markup
         
         await update.message.reply_text(
             f"✅ Your price threshold updated to {threshold}%",
@@ -1328,120 +1240,17 @@ class TelegramHandler:
     async def _handle_token_query(self, update: Update, query: str):
         """Handle when user sends a token name/symbol for info"""
         if not self.tracker:
-            await update.message.reply_text("Tracker not available.", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text("Tracker not available.", reply_markup=self._main_menu_markup)
             return
         
         try:
-            token_data = await self.tracker.get_token_info_with_timestamp(query)
-            
-            # Format message with inline keyboard
-            keyboard = [
-                [
-                    InlineKeyboardButton("➕ Track This", callback_data=f"track:{token_data['address']}"),
-                    InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh:{token_data['address']}")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Format message with only requested variables
-            chat_id = str(update.effective_chat.id)
-            message = f"📊 **Token Information**\n\n"
-            message += f"🏷️ **Name:** {token_data['name']}\n"
-            message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-            message += f"🔗 **Address:** `{token_data['address']}`\n"
-            message += f"💰 **Current Price:** ${token_data['price']:.8f}\n"
-            
-            # Check if user is tracking this token and show entry performance
-            user_tokens = self.user_manager.get_user_tokens(chat_id)
-            if token_data['address'] in user_tokens:
-                entry_price = self.user_manager.get_entry_price(chat_id, token_data['address'])
-                if entry_price:
-                    price_change = ((token_data['price'] - entry_price) / entry_price) * 100
-                    emoji = "📈" if price_change > 0 else "📉"
-                    message += f"📊 **Entry Price:** ${entry_price:.8f}\n"
-                    message += f"📊 **Entry Performance:** {emoji} {price_change:+.2f}% since entry\n"
-                message += f"🎯 **You're tracking this token**\n"
-            
-            message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-            message += f"📊 **24h Volume:** ${token_data.get('volume_24h', 0):,.2f}\n"
-            
-            # Volume 1h and 6h if available
-            if token_data.get('volume_1h', 0) > 0:
-                message += f"📊 **1h Volume:** ${token_data['volume_1h']:,.2f}\n"
-            if token_data.get('volume_6h', 0) > 0:
-                message += f"📊 **6h Volume:** ${token_data['volume_6h']:,.2f}\n"
-            
-            # Price changes
-            if token_data.get('price_change_24h') is not None:
-                change_24h = token_data['price_change_24h']
-                emoji = "📈" if change_24h > 0 else "📉"
-                message += f"📊 **24h Change:** {emoji} {change_24h:+.2f}%\n"
-            
-            if token_data.get('price_change_1h') is not None:
-                change_1h = token_data['price_change_1h']
-                emoji = "📈" if change_1h > 0 else "📉"
-                message += f"⏰ **1h Change:** {emoji} {change_1h:+.2f}%\n"
-            
-            if token_data.get('price_change_6h') is not None:
-                change_6h = token_data['price_change_6h']
-                emoji = "📈" if change_6h > 0 else "📉"
-                message += f"⏰ **6h Change:** {emoji} {change_6h:+.2f}%\n"
-            
-            # Trading activity
-            buys_24h = token_data.get('txns_24h_buys', 0)
-            sells_24h = token_data.get('txns_24h_sells', 0)
-            if buys_24h > 0 or sells_24h > 0:
-                message += f"🔄 **24h Transactions:** {buys_24h} buys / {sells_24h} sells\n"
+            token_data = await self._cached_token_info(query)
             
-            # Websites
-            websites = token_data.get('websites', [])
-            if websites:
-                website_links = []
-                for website in websites:
-                    url = website.get('url', '')
-                    label = website.get('label', 'Website')
-                    if url:
-                        website_links.append(f"[{label}]({url})")
-                if website_links:
-                    message += f"🌐 **Websites:** {' | '.join(website_links)}\n"
+            chat_id = _chat_key(update.effective_chat.id)
+            token_ctx = self.user_manager.get_token_context(chat_id, token_data['address'])
+            message = "".join(["📊 **Token Information**\n\n", *token_info_lines(token_data, token_ctx)])
             
-            # Social links
-            socials = token_data.get('socials', [])
-            if socials:
-                social_links = []
-                for social in socials:
-                    social_type = social.get('type', '').lower()
-                    social_url = social.get('url', '')
-                    if social_url:
-                        if social_type == 'twitter':
-                            social_links.append(f"[Twitter]({social_url})")
-                        elif social_type == 'telegram':
-                            social_links.append(f"[Telegram]({social_url})")
-                        elif social_type == 'discord':
-                            social_links.append(f"[Discord]({social_url})")
-                        elif social_type == 'website':
-                            social_links.append(f"[Website]({social_url})")
-                        else:
-                            social_links.append(f"[{social_type.capitalize()}]({social_url})")
-                if social_links:
-                    message += f"🌐 **Socials:** {' | '.join(social_links)}\n"
-            
-            # Image URL if available
-            if token_data.get('image_url'):
-                message += f"🖼️ **Image:** [View]({token_data['image_url']})\n"
-            
-            # Add copy address button to existing keyboard
-            keyboard = [
-                [
-                    InlineKeyboardButton("➕ Track This", callback_data=f"track:{token_data['address']}"),
-                    InlineKeyboardButton("🔄 Refresh", callback_data=f"refresh:{token_data['address']}")
-                ],
-                [
-                    InlineKeyboardButton("📋 Copy Address", callback_data=f"copy:{token_data['address']}")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _token_query_markup(token_data['address'])
             
             await update.message.reply_text(
                 message, 
@@ -1451,11 +1260,11 @@ class TelegramHandler:
             )
             
         except Exception as e:
-            await update.message.reply_text(f"❌ Could not find token: {query}", reply_markup=self.get_main_menu_keyboard())
+            await update.message.reply_text(f"❌ Could not find token: {query}", reply_markup=self._main_menu_markup)
     
     async def _handle_unknown_message(self, update: Update, text: str):
         """Handle unrecognized messages"""
-        reply_markup = self.get_main_menu_keyboard()
+        reply_markup = self._main_menu_markup
         
         await update.message.reply_text(
             "I didn't understand that message. Use the buttons below or send:\n\n"
@@ -1466,34 +1275,43 @@ class TelegramHandler:
         )
     
     async def _is_authorized_query(self, query) -> bool:
-        chat_id = str(query.from_user.id)
+        chat_id = _chat_key(query.from_user.id)
         user_data = self.user_manager.get_user(chat_id)
-        if not user_data or not user_data['active']:
-            await query.edit_message_text("Please send /start first to use this bot.", reply_markup=self.get_main_menu_keyboard())
+        if not user_data or not user_data.active:
+            await self._reply(query, "Please send /start first to use this bot.")
             return False
         return True
     
     async def _is_authorized(self, update: Update) -> bool:
-        chat_id = str(update.effective_chat.id)
+        chat_id = _chat_key(update.effective_chat.id)
         user_data = self.user_manager.get_user(chat_id)
-        if not user_data or not user_data['active']:
-            await update.message.reply_text("Please send /start first to use this bot.", reply_markup=self.get_main_menu_keyboard())
+        if not user_data or not user_data.active:
+            await update.message.reply_text("Please send /start first to use this bot.", reply_markup=self._main_menu_markup)
             return False
         return True
     
     async def initialize(self):
-        self.app = Application.builder().token(config.telegram_bot_token).build()
-        
-        self.app.add_handler(CommandHandler("start", self.start_command))
-        self.app.add_handler(CommandHandler("status", self.status_command))
-        self.app.add_handler(CommandHandler("tokens", self.tokens_command))
-        self.app.add_handler(CommandHandler("threshold", self.threshold_command))
-        self.app.add_handler(CommandHandler("setthreshold", self.set_token_threshold_command))
-        self.app.add_handler(CommandHandler("add", self.add_command))
-        self.app.add_handler(CommandHandler("get", self.get_command))
-        self.app.add_handler(CommandHandler("remove", self.remove_command))
-        self.app.add_handler(CommandHandler("reset", self.reset_command))
-        self.app.add_handler(CommandHandler("stop", self.stop_command))
+        self.app = (
+            Application.builder()
+            .token(get_config().telegram_bot_token)
+            .request(OrjsonRequest())
+            .get_updates_request(OrjsonRequest())
+            .build()
+        )
+        
+        commands = (
+            ("start", self.start_command),
+            ("status", self.status_command),
+            ("tokens", self.tokens_command),
+            ("threshold", self.threshold_command),
+            ("setthreshold", self.set_token_threshold_command),
+            ("add", self.add_command),
+            ("get", self.get_command),
+            ("remove", self.remove_command),
+            ("reset", self.reset_command),
+            ("stop", self.stop_command),
+        )
+        self.app.add_handlers([CommandHandler(name, callback) for name, callback in commands])
         
         # Add callback query handler for inline buttons
         self.app.add_handler(CallbackQueryHandler(self.button_callback))
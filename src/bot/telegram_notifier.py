@@ -1,82 +1,153 @@
 import asyncio
+import logging
 from typing import Dict, Any, Optional, List
 from telegram import Bot
-from telegram.error import TelegramError
-from datetime import datetime
+from telegram.error import RetryAfter, TelegramError
+from datetime import datetime, timedelta
+from .json_request import OrjsonRequest
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on queued messages sent together per wakeup
+_MAX_BATCH = 32
+
+# Most Telegram sends in flight at once; this bounds concurrency only, _SEND_INTERVAL bounds the rate
+_MAX_CONCURRENT_SENDS = 25
+
+# Seconds between send starts, keeping the bot under the API's ~30 messages/second limit
+_SEND_INTERVAL = 1 / 30
+
+# Attempts per message when Telegram answers with RetryAfter
+_MAX_SEND_ATTEMPTS = 3
+
+_PRICE_ALERT_UP = "<b>🚨 📈 Price Alert!</b>\n\n"
+_PRICE_ALERT_DOWN = "<b>🚨 📉 Price Alert!</b>\n\n"
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _usd_or_na(value) -> str:
+    """Whole-dollar amount, or N/A when the value is missing or zero"""
+    return f"${value:,.0f}" if value > 0 else "N/A"
+
 
 class TelegramNotifier:
     def __init__(self, bot_token: str, chat_ids: Optional[List[str]] = None):
-        self.bot = Bot(token=bot_token)
+        self.bot = Bot(token=bot_token, request=OrjsonRequest())
         self.chat_ids = chat_ids or []
         self._message_queue = asyncio.Queue()
         self._running = False
+        self._worker: Optional[asyncio.Task] = None
+        self._send_slots = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
+        self._next_send = 0.0  # Loop time the next send may start at
+        self._resume_at = 0.0  # Loop time a RetryAfter pause ends
     
     async def start(self):
         self._running = True
-        asyncio.create_task(self._process_messages())
+        self._worker = asyncio.create_task(self._process_messages())
     
     async def stop(self):
         self._running = False
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
     
     async def _process_messages(self):
         while self._running:
             try:
-                if not self._message_queue.empty():
-                    message = await self._message_queue.get()
-                    await self._send_message(message)
-                await asyncio.sleep(1)
+                # Block until something is queued, then take whatever else is already waiting
+                batch = [await self._message_queue.get()]
+                while not self._message_queue.empty() and len(batch) < _MAX_BATCH:
+                    batch.append(self._message_queue.get_nowait())
+                await asyncio.gather(*(self._send_message(message) for message in batch))
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                print(f"Error processing messages: {e}")
+                logger.error("Error processing messages: %s", e)
     
     async def _send_message(self, message: str):
-        for chat_id in self.chat_ids:
-            try:
-                await self.bot.send_message(
-                    chat_id=chat_id,
-                    text=message,
-                    parse_mode='HTML'
-                )
-            except TelegramError as e:
-                print(f"Failed to send Telegram message to {chat_id}: {e}")
+        chat_ids = list(self.chat_ids)
+        results = await asyncio.gather(
+            *(self._send(chat_id, message) for chat_id in chat_ids),
+            return_exceptions=True
+        )
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, TelegramError):
+                logger.warning("Failed to send Telegram message to %s: %s", chat_id, result)
+            elif isinstance(result, BaseException):
+                raise result
+    
+    async def _wait_send_slot(self):
+        """Wait for this send's turn, so sends start at most one per _SEND_INTERVAL"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            # Claim the slot before sleeping, so concurrent senders space out instead of all firing at once
+            slot = max(now, self._next_send)
+            self._next_send = slot + _SEND_INTERVAL
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            # A RetryAfter that arrived while waiting pushed every slot back; queue again behind it
+            if loop.time() >= self._resume_at:
+                return
+    
+    async def _send(self, chat_id: str, message: str):
+        """Send one HTML message, rate limited, resending after the wait Telegram asks for on RetryAfter"""
+        async with self._send_slots:
+            for attempt in range(1, _MAX_SEND_ATTEMPTS + 1):
+                await self._wait_send_slot()
+                try:
+                    await self.bot.send_message(chat_id=chat_id, text=message, parse_mode='HTML')
+                    return
+                except RetryAfter as e:
+                    if attempt == _MAX_SEND_ATTEMPTS:
+                        raise
+                    delay = e.retry_after
+                    if isinstance(delay, timedelta):
+                        delay = delay.total_seconds()
+                    # The flood limit is per bot, so hold back every other send for the same wait
+                    self._resume_at = asyncio.get_running_loop().time() + delay
+                    self._next_send = max(self._next_send, self._resume_at)
+                    logger.warning("Telegram flood limit hit sending to %s, retrying in %ss", chat_id, delay)
     
     async def _send_message_to_user(self, user_id: str, message: str):
         """Send message to specific user"""
         try:
-            await self.bot.send_message(
-                chat_id=user_id,
-                text=message,
-                parse_mode='HTML'
-            )
+            await self._send(user_id, message)
         except TelegramError as e:
-            print(f"Failed to send Telegram message to {user_id}: {e}")
+            logger.warning("Failed to send Telegram message to %s: %s", user_id, e)
     
-    def format_price_alert(self, token_data: Dict[str, Any]) -> str:
-        change_emoji = "📈" if token_data['change_percent'] > 0 else "📉"
+    def _build_price_alert(self, token_data: Dict[str, Any], entry_price: Optional[float] = None, time_str: Optional[str] = None) -> str:
+        """Render a price alert, with entry price and total change when one is given"""
+        header = _PRICE_ALERT_UP if token_data['change_percent'] > 0 else _PRICE_ALERT_DOWN
+        address = token_data['token_address']
         
-        # Format market cap and liquidity
-        market_cap = token_data.get('market_cap', 0)
-        liquidity = token_data.get('liquidity', 0)
-        volume_24h = token_data.get('volume_24h', 0)
+        parts = [
+            header,
+            f"📊 <b>Token:</b> {token_data.get('token_name', 'Unknown')} ({token_data.get('token_symbol', 'UNK')})\n",
+            f"🔗 <b>Address:</b> <code>{address[:8]}...{address[-8:]}</code>\n",
+            f"⚡ <b>Price Change:</b> {token_data['change_percent']:+.2f}%\n",
+            f"📉 <b>Old Price:</b> ${token_data['old_price']:.8f}\n",
+            f"💰 <b>New Price:</b> ${token_data['new_price']:.8f}\n",
+        ]
         
-        market_cap_str = f"${market_cap:,.0f}" if market_cap > 0 else "N/A"
-        liquidity_str = f"${liquidity:,.0f}" if liquidity > 0 else "N/A"
-        volume_str = f"${volume_24h:,.0f}" if volume_24h > 0 else "N/A"
+        if entry_price:
+            total_change = ((token_data['new_price'] - entry_price) / entry_price) * 100
+            parts.append(f"🎯 <b>Entry Price:</b> ${entry_price:.8f}\n")
+            parts.append(f"📊 <b>Total Change:</b> {total_change:+.2f}%\n")
         
-        return (
-            f"<b>🚨 {change_emoji} Price Alert!</b>\n\n"
-            f"📊 <b>Token:</b> {token_data.get('token_name', 'Unknown')} ({token_data.get('token_symbol', 'UNK')})\n"
-            f"🔗 <b>Address:</b> <code>{token_data['token_address'][:8]}...{token_data['token_address'][-8:]}</code>\n"
-            f"⚡ <b>Price Change:</b> {token_data['change_percent']:+.2f}%\n"
-            f"📉 <b>Old Price:</b> ${token_data['old_price']:.8f}\n"
-            f"💰 <b>New Price:</b> ${token_data['new_price']:.8f}\n"
-            f"📈 <b>Market Cap:</b> {market_cap_str}\n"
-            f"💧 <b>Liquidity:</b> {liquidity_str}\n"
-            f"📊 <b>24h Volume:</b> {volume_str}\n"
-            f"🏪 <b>DEX:</b> {token_data.get('dex', 'unknown').title()}\n"
-            f"⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        )
-    
-    def format_holder_alert(self, token_data: Dict[str, Any]) -> str:
+        parts += [
+            f"📈 <b>Market Cap:</b> {_usd_or_na(token_data.get('market_cap', 0))}\n",
+            f"💧 <b>Liquidity:</b> {_usd_or_na(token_data.get('liquidity', 0))}\n",
+            f"📊 <b>24h Volume:</b> {_usd_or_na(token_data.get('volume_24h', 0))}\n",
+            f"🏪 <b>DEX:</b> {token_data.get('dex', 'unknown').title()}\n",
+            f"⏰ <b>Time:</b> {time_str or datetime.now().strftime(_TIME_FORMAT)}\n",
+        ]
+        return "".join(parts)
+    
+    def format_price_alert(self, token_data: Dict[str, Any], time_str: Optional[str] = None) -> str:
+        return self._build_price_alert(token_data, time_str=time_str)
+    
+    def format_holder_alert(self, token_data: Dict[str, Any], time_str: Optional[str] = None) -> str:
         change = token_data['new_holders'] - token_data['old_holders']
         change_symbol = "+" if change > 0 else ""
         change_emoji = "📈" if change > 0 else "📉"
@@ -87,7 +158,7 @@ class TelegramNotifier:
             f"⚡ <b>Change:</b> {change_emoji} {change_symbol}{change} holders\n"
             f"📉 <b>Old Count:</b> {token_data['old_holders']}\n"
             f"👥 <b>New Count:</b> {token_data['new_holders']}\n"
-            f"⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"⏰ <b>Time:</b> {time_str or datetime.now().strftime(_TIME_FORMAT)}\n"
         )
     
     async def send_price_alert(self, token_data: Dict[str, Any]):
@@ -116,48 +187,12 @@ class TelegramNotifier:
         """Public method to send message to specific user"""
         await self._send_message_to_user(user_id, message)
     
-    async def send_price_alert_to_user(self, user_id: str, token_data: Dict[str, Any]):
+    async def send_price_alert_to_user(self, user_id: str, token_data: Dict[str, Any], time_str: Optional[str] = None):
         """Send price alert to specific user"""
-        # Add entry price info if available
-        entry_price = token_data.get('entry_price')
-        
-        change_emoji = "📈" if token_data['change_percent'] > 0 else "📉"
-        
-        # Format market cap and liquidity
-        market_cap = token_data.get('market_cap', 0)
-        liquidity = token_data.get('liquidity', 0)
-        volume_24h = token_data.get('volume_24h', 0)
-        
-        market_cap_str = f"${market_cap:,.0f}" if market_cap > 0 else "N/A"
-        liquidity_str = f"${liquidity:,.0f}" if liquidity > 0 else "N/A"
-        volume_str = f"${volume_24h:,.0f}" if volume_24h > 0 else "N/A"
-        
-        message = (
-            f"<b>🚨 {change_emoji} Price Alert!</b>\n\n"
-            f"📊 <b>Token:</b> {token_data.get('token_name', 'Unknown')} ({token_data.get('token_symbol', 'UNK')})\n"
-            f"🔗 <b>Address:</b> <code>{token_data['token_address'][:8]}...{token_data['token_address'][-8:]}</code>\n"
-            f"⚡ <b>Price Change:</b> {token_data['change_percent']:+.2f}%\n"
-            f"📉 <b>Old Price:</b> ${token_data['old_price']:.8f}\n"
-            f"💰 <b>New Price:</b> ${token_data['new_price']:.8f}\n"
-        )
-        
-        # Add entry price and total change if available
-        if entry_price:
-            total_change = ((token_data['new_price'] - entry_price) / entry_price) * 100
-            message += f"🎯 <b>Entry Price:</b> ${entry_price:.8f}\n"
-            message += f"📊 <b>Total Change:</b> {total_change:+.2f}%\n"
-        
-        message += (
-            f"📈 <b>Market Cap:</b> {market_cap_str}\n"
-            f"💧 <b>Liquidity:</b> {liquidity_str}\n"
-            f"📊 <b>24h Volume:</b> {volume_str}\n"
-            f"🏪 <b>DEX:</b> {token_data.get('dex', 'unknown').title()}\n"
-            f"⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        )
-        
+        message = self._build_price_alert(token_data, token_data.get('entry_price'), time_str)
         await self._send_message_to_user(user_id, message)
     
-    async def send_holder_alert_to_user(self, user_id: str, token_data: Dict[str, Any]):
+    async def send_holder_alert_to_user(self, user_id: str, token_data: Dict[str, Any], time_str: Optional[str] = None):
         """Send holder alert to specific user"""
         change = token_data.get('change', token_data['new_holders'] - token_data['old_holders'])
         change_symbol = "+" if change > 0 else ""
@@ -170,7 +205,7 @@ class TelegramNotifier:
             f"⚡ <b>Change:</b> {change_emoji} {change_symbol}{change} holders ({token_data.get('change_percent', 0):+.1f}%)\n"
             f"📉 <b>Old Count:</b> {token_data['old_holders']}\n"
             f"👥 <b>New Count:</b> {token_data['new_holders']}\n"
-            f"⏰ <b>Time:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"⏰ <b>Time:</b> {time_str or datetime.now().strftime(_TIME_FORMAT)}\n"
         )
         
         await self._send_message_to_user(user_id, message)
\ No newline at end of file
@@ -1,197 +1,444 @@
 import os
-import pandas as pd
+import csv
+import gzip
+import io
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import aiofiles
 import asyncio
+from collections import defaultdict, deque
 from pathlib import Path
 
+_PRICE_HEADER = ('timestamp', 'price', 'address')
+_HOLDER_HEADER = ('timestamp', 'holder_count', 'address')
+_ALERT_HEADER = ('timestamp', 'token_address', 'alert_type', 'old_value', 'new_value', 'change_percent', 'message')
+
+_TRACKED_HEADER = ('token_address', 'added_timestamp', 'threshold', 'direction')
+_TOKEN_LOG_HEADER = ('op', 'token_address', 'threshold', 'direction', 'timestamp')
+
+# Tracked-token changes appended to the log before it is folded into tracked_tokens.csv
+_TOKEN_LOG_COMPACT_EVERY = 100
+
+# Bytes read per step when scanning a CSV backwards from its end
+_TAIL_CHUNK = 64 * 1024
+
+# A time-series file past _HOT_MAX_ROWS keeps its newest _HOT_KEEP_ROWS and moves the rest
+# to a gzip archive next to it; the size is checked every _ROTATE_CHECK_EVERY writes
+_HOT_MAX_ROWS = 10_000
+_HOT_KEEP_ROWS = 1_000
+_ROTATE_CHECK_EVERY = 1_000
+
+
+def _coerce(value: str) -> Any:
+    """Turn a CSV cell back into an int/float where it holds a number"""
+    if value == '':
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _archive_path(file_path: Path) -> Path:
+    """Cold archive that sits next to a hot time-series CSV"""
+    return file_path.with_suffix('.csv.gz')
+
+
+def _rotate_file(file_path: Path):
+    """Move all but the newest rows of an oversized CSV into its archive (blocking)"""
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        rows = f.read().splitlines(keepends=True)
+    if len(rows) <= _HOT_MAX_ROWS:
+        return
+    
+    # gzip streams concatenate, so each rotation appends a new member
+    with gzip.open(_archive_path(file_path), 'ab') as gz:
+        gz.writelines(rows[:-_HOT_KEEP_ROWS])
+    
+    tmp_path = file_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.writelines(rows[-_HOT_KEEP_ROWS:])
+    os.replace(tmp_path, file_path)
+
+
+def _read_archive_tail(file_path: Path, limit: int) -> List[str]:
+    """Last `limit` archived rows for a time-series CSV, oldest first, streamed so only those stay in memory (blocking)"""
+    archive = _archive_path(file_path)
+    if not archive.exists():
+        return []
+    with gzip.open(archive, 'rt', newline='') as gz:
+        return list(deque(filter(None, (line.rstrip('\r\n') for line in gz)), maxlen=limit))
+
+
+def _csv_line(row) -> str:
+    """Format one CSV record (with quoting) as a newline-terminated string"""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='\n').writerow(row)
+    return buf.getvalue()
+
+
+def _series_line(row: Tuple[str, Any, str]) -> str:
+    """Format a (timestamp, value, address) row directly, skipping csv.writer for the common case"""
+    timestamp, value, token_address = row
+    # Timestamps and numbers never need quoting; only an unusual address would
+    if value is None or ',' in token_address or '"' in token_address or '\n' in token_address:
+        return _csv_line(row)
+    return f"{timestamp},{value},{token_address}\n"
+
+
 class CSVStorage:
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self._lock = asyncio.Lock()
+        self._lock = asyncio.Lock()  # Guards the tracked token state only
+        self._file_locks: Dict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)  # One writer per time-series file
+        self._known_files = set()  # Files already checked/created, so exists() runs once per file
+        self._write_counts: Dict[Path, int] = defaultdict(int)  # Time-series writes since startup, for rotation
+        self._latest_price: Dict[str, Dict[str, Any]] = {}
+        self._latest_holders: Dict[str, Dict[str, Any]] = {}
+        self._headers: Dict[Path, Tuple[List[str], int]] = {}  # Parsed header and its byte length per file
+        # Tracked tokens are held in memory once loaded; changes go to an append-only log
+        # token_address -> {'added_timestamp', 'value', 'direction'}; value 0.0 means use the global threshold
+        self._tokens_dict: Optional[Dict[str, Dict[str, Any]]] = None
+        self._token_log_mutations = 0
     
     def _get_file_path(self, token_address: str, data_type: str = "prices") -> Path:
         safe_address = token_address.replace("/", "_")
         return self.data_dir / f"{safe_address}_{data_type}.csv"
     
-    async def save_price_data(self, token_address: str, price_data: Dict[str, Any]):
-        async with self._lock:
-            file_path = self._get_file_path(token_address, "prices")
-            
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'price': price_data.get('price', 0),
-                'address': token_address
-            }
-            
-            df = pd.DataFrame([data])
-            
-            if file_path.exists():
-                existing_df = pd.read_csv(file_path)
-                df = pd.concat([existing_df, df], ignore_index=True)
-            
-            df.to_csv(file_path, index=False)
+    def _exists(self, file_path: Path) -> bool:
+        """exists() that remembers hits, so files this instance has seen are never stat'd again"""
+        if file_path in self._known_files:
+            return True
+        if file_path.exists():
+            self._known_files.add(file_path)
+            return True
+        return False
     
-    async def save_holder_data(self, token_address: str, holder_count: int):
-        async with self._lock:
-            file_path = self._get_file_path(token_address, "holders")
-            
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'holder_count': holder_count,
-                'address': token_address
-            }
-            
-            df = pd.DataFrame([data])
-            
-            if file_path.exists():
-                existing_df = pd.read_csv(file_path)
-                df = pd.concat([existing_df, df], ignore_index=True)
+    async def _append_row(self, file_path: Path, header, line: str):
+        """Append a single formatted record, writing the header first if the file is new"""
+        is_new = not self._exists(file_path)
+        async with aiofiles.open(file_path, 'a', newline='') as f:
+            if is_new:
+                await f.write(_csv_line(header))
+            await f.write(line)
+        self._known_files.add(file_path)
+    
+    async def _tail_csv(self, file_path: Path, limit: int) -> List[Dict[str, Any]]:
+        """Parse only the last `limit` rows by reading the file backwards in 64KB chunks"""
+        if limit <= 0:
+            return []
+        
+        async with aiofiles.open(file_path, 'rb') as f:
+            header_info = await self._read_header(f, file_path)
+            if header_info is None:
+                return []
+            header, header_len = header_info
             
-            df.to_csv(file_path, index=False)
+            # Walk back until the buffer holds `limit` complete lines (or reaches the header)
+            pos = await f.seek(0, os.SEEK_END)
+            data = b''
+            while pos > header_len and data.count(b'\n') <= limit:
+                step = min(_TAIL_CHUNK, pos - header_len)
+                pos -= step
+                await f.seek(pos)
+                data = await f.read(step) + data
+        
+        lines = [line for line in data.decode(errors='replace').splitlines() if line][-limit:]
+        return [dict(zip(header, map(_coerce, row))) for row in csv.reader(lines)]
+    
+    async def _read_header(self, f, file_path: Path) -> Optional[Tuple[List[str], int]]:
+        """Parsed header and its byte length, read from the open file once per path"""
+        if file_path not in self._headers:
+            await f.seek(0)
+            header_line = await f.readline()
+            if not header_line.endswith(b'\n'):
+                return None
+            self._headers[file_path] = (next(csv.reader([header_line.decode().rstrip('\r\n')])), len(header_line))
+        return self._headers[file_path]
+    
+    async def _archive_tail(self, file_path: Path, limit: int) -> List[Dict[str, Any]]:
+        """Last `limit` archived rows, parsed with the hot file's header"""
+        header_info = self._headers.get(file_path)
+        if header_info is None or limit <= 0:
+            return []
+        archived = await asyncio.to_thread(_read_archive_tail, file_path, limit)
+        return [dict(zip(header_info[0], map(_coerce, row))) for row in csv.reader(archived)]
+    
+    async def _history(self, file_path: Path, limit: int) -> List[Dict[str, Any]]:
+        """Last `limit` rows, reading the archive only when the hot file holds fewer"""
+        async with self._file_locks[file_path]:
+            records = await self._tail_csv(file_path, limit)
+            if len(records) < limit:
+                records = await self._archive_tail(file_path, limit - len(records)) + records
+            return records
+    
+    async def _maybe_rotate(self, file_path: Path):
+        """Every _ROTATE_CHECK_EVERY writes, archive the file's older rows if it has grown too large (file lock held)"""
+        self._write_counts[file_path] += 1
+        if self._write_counts[file_path] % _ROTATE_CHECK_EVERY == 0:
+            await asyncio.to_thread(_rotate_file, file_path)
+    
+    async def save_price_data(self, token_address: str, price_data: Dict[str, Any], timestamp: Optional[str] = None):
+        file_path = self._get_file_path(token_address, "prices")
+        async with self._file_locks[file_path]:
+            row = (timestamp or datetime.now().isoformat(), price_data.get('price', 0), token_address)
+            await self._append_row(file_path, _PRICE_HEADER, _series_line(row))
+            self._latest_price[token_address] = dict(zip(_PRICE_HEADER, row))
+            await self._maybe_rotate(file_path)
+    
+    async def save_holder_data(self, token_address: str, holder_count: int, timestamp: Optional[str] = None):
+        file_path = self._get_file_path(token_address, "holders")
+        async with self._file_locks[file_path]:
+            row = (timestamp or datetime.now().isoformat(), holder_count, token_address)
+            await self._append_row(file_path, _HOLDER_HEADER, _series_line(row))
+            self._latest_holders[token_address] = dict(zip(_HOLDER_HEADER, row))
+            await self._maybe_rotate(file_path)
     
     async def get_latest_price(self, token_address: str) -> Optional[Dict[str, Any]]:
+        latest = self._latest_price.get(token_address)
+        if latest is not None:
+            return latest
+        
+        # Cold start: nothing saved this run yet, so fall back to the file's last row
         file_path = self._get_file_path(token_address, "prices")
+        if not self._exists(file_path):
+            return None
         
-        if not file_path.exists():
+        records = await self._tail_csv(file_path, 1)
+        if not records:
+            return None
+        record = records[0]
+        
+        latest = {
+            'timestamp': record['timestamp'],
+            'price': float(record['price']),
+            'address': record['address']
+        }
+        self._latest_price[token_address] = latest
+        return latest
+    
+    async def get_latest_holders(self, token_address: str) -> Optional[Dict[str, Any]]:
+        latest = self._latest_holders.get(token_address)
+        if latest is not None:
+            return latest
+        
+        file_path = self._get_file_path(token_address, "holders")
+        if not self._exists(file_path):
             return None
         
-        df = pd.read_csv(file_path)
-        if df.empty:
+        records = await self._tail_csv(file_path, 1)
+        if not records:
             return None
+        record = records[0]
         
-        latest = df.iloc[-1]
-        return {
-            'timestamp': latest['timestamp'],
-            'price': float(latest['price']),
-            'address': latest['address']
+        latest = {
+            'timestamp': record['timestamp'],
+            'holder_count': int(float(record['holder_count'])),
+            'address': record['address']
         }
+        self._latest_holders[token_address] = latest
+        return latest
+    
+    async def get_latest_prices(self, token_addresses: List[str]) -> Dict[str, float]:
+        """Last stored price per token, for tokens that have one; the per-token file tails are read concurrently"""
+        records = await asyncio.gather(*(self.get_latest_price(t) for t in token_addresses))
+        return {t: record['price'] for t, record in zip(token_addresses, records) if record}
+    
+    async def get_latest_holder_counts(self, token_addresses: List[str]) -> Dict[str, int]:
+        """Last stored holder count per token, for tokens that have one; the per-token file tails are read concurrently"""
+        records = await asyncio.gather(*(self.get_latest_holders(t) for t in token_addresses))
+        return {t: record['holder_count'] for t, record in zip(token_addresses, records) if record}
     
     async def get_price_history(self, token_address: str, limit: int = 100) -> List[Dict[str, Any]]:
         file_path = self._get_file_path(token_address, "prices")
         
-        if not file_path.exists():
+        if not self._exists(file_path):
             return []
         
-        df = pd.read_csv(file_path)
-        df = df.tail(limit)
-        
-        return df.to_dict('records')
+        return await self._history(file_path, limit)
     
     async def get_holder_history(self, token_address: str, limit: int = 100) -> List[Dict[str, Any]]:
         file_path = self._get_file_path(token_address, "holders")
         
-        if not file_path.exists():
+        if not self._exists(file_path):
             return []
         
-        df = pd.read_csv(file_path)
-        df = df.tail(limit)
+        return await self._history(file_path, limit)
+    
+    async def save_alert_log(self, alert_data: Dict[str, Any], timestamp: Optional[str] = None):
+        await self.save_alert_logs([alert_data], timestamp)
+    
+    async def save_alert_logs(self, alerts: List[Dict[str, Any]], timestamp: Optional[str] = None):
+        """Append several alert rows with one open and one write"""
+        if not alerts:
+            return
+        file_path = self.data_dir / "alerts_log.csv"
+        timestamp = timestamp or datetime.now().isoformat()
+        lines = "".join(
+            _csv_line((
+                timestamp,
+                alert_data.get('token_address'),
+                alert_data.get('alert_type'),
+                alert_data.get('old_value'),
+                alert_data.get('new_value'),
+                alert_data.get('change_percent'),
+                alert_data.get('message', '')
+            ))
+            for alert_data in alerts
+        )
+        async with self._file_locks[file_path]:
+            await self._append_row(file_path, _ALERT_HEADER, lines)
+    
+    async def _write_tracked_tokens(self):
+        """Atomically replace the canonical tracked_tokens.csv from memory, then drop the change log (lock held)"""
+        file_path = self.data_dir / "tracked_tokens.csv"
+        
+        content = _csv_line(_TRACKED_HEADER) + ''.join(
+            # direction is one of both, positive, negative
+            _csv_line((token, entry['added_timestamp'], entry['value'], entry['direction']))
+            for token, entry in self._tokens_dict.items()
+        )
+        # Swap the new file in before dropping the log, so a crash leaves one of them intact
+        tmp_path = file_path.with_suffix('.tmp')
+        async with aiofiles.open(tmp_path, 'w', newline='') as f:
+            await f.write(content)
+        os.replace(tmp_path, file_path)
         
-        return df.to_dict('records')
+        log_path = self.data_dir / "tracked_tokens.log.csv"
+        if log_path.exists():
+            log_path.unlink()
+        self._known_files.discard(log_path)
+        self._token_log_mutations = 0
     
-    async def save_alert_log(self, alert_data: Dict[str, Any]):
-        async with self._lock:
-            file_path = self.data_dir / "alerts_log.csv"
-            
-            data = {
-                'timestamp': datetime.now().isoformat(),
-                'token_address': alert_data.get('token_address'),
-                'alert_type': alert_data.get('alert_type'),
-                'old_value': alert_data.get('old_value'),
-                'new_value': alert_data.get('new_value'),
-                'change_percent': alert_data.get('change_percent'),
-                'message': alert_data.get('message', '')
-            }
-            
-            df = pd.DataFrame([data])
-            
-            if file_path.exists():
-                existing_df = pd.read_csv(file_path)
-                df = pd.concat([existing_df, df], ignore_index=True)
+    async def _log_token_change(self, op: str, token_address: str, threshold: float = 0.0, direction: str = 'both'):
+        """Append one change record and compact once enough have piled up (lock held)"""
+        row = (op, token_address, threshold, direction, datetime.now().isoformat())
+        await self._append_row(self.data_dir / "tracked_tokens.log.csv", _TOKEN_LOG_HEADER, _csv_line(row))
+        self._token_log_mutations += 1
+        if self._token_log_mutations >= _TOKEN_LOG_COMPACT_EVERY:
+            await self._write_tracked_tokens()
+    
+    @staticmethod
+    def _token_entry(threshold: float = 0.0, direction: str = 'both', added_timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Build an in-memory tracked-token entry; non-positive thresholds fall back to the global one"""
+        return {
+            'added_timestamp': added_timestamp or datetime.now().isoformat(),
+            'value': threshold if threshold > 0 else 0.0,
+            'direction': direction if threshold > 0 else 'both'
+        }
+    
+    async def _read_tracked_tokens(self) -> Dict[str, Dict[str, Any]]:
+        """Read the canonical tracked_tokens.csv into token_address -> entry form"""
+        file_path = self.data_dir / "tracked_tokens.csv"
+        
+        if not file_path.exists():
+            return {}
+        
+        try:
+            async with aiofiles.open(file_path, 'r', newline='') as f:
+                content = await f.read()
             
-            df.to_csv(file_path, index=False)
+            tokens = {}
+            for row in csv.DictReader(io.StringIO(content)):
+                # Older files may lack the threshold/direction columns
+                tokens[row['token_address']] = self._token_entry(
+                    float(row.get('threshold') or 0.0),
+                    row.get('direction') or 'both',
+                    row.get('added_timestamp')
+                )
+            return tokens
+        except Exception:
+            return {}
+    
+    async def _ensure_tokens_loaded(self):
+        """Load tracked tokens once: canonical file plus any changes logged since the last compaction"""
+        if self._tokens_dict is not None:
+            return
+        
+        self._tokens_dict = await self._read_tracked_tokens()
+        
+        log_path = self.data_dir / "tracked_tokens.log.csv"
+        if not log_path.exists():
+            return
+        
+        async with aiofiles.open(log_path, 'r', newline='') as f:
+            content = await f.read()
+        for record in csv.DictReader(io.StringIO(content)):
+            self._token_log_mutations += 1
+            token, op = record['token_address'], record['op']
+            threshold = float(record['threshold'] or 0)
+            if op == 'add':
+                self._tokens_dict.setdefault(token, self._token_entry(threshold, record['direction'], record['timestamp']))
+            elif op == 'remove':
+                self._tokens_dict.pop(token, None)
+            elif op == 'threshold' and token in self._tokens_dict:
+                self._tokens_dict[token].update(self._token_entry(threshold, record['direction'], self._tokens_dict[token]['added_timestamp']))
+    
+    async def compact(self):
+        """Fold the tracked token change log into tracked_tokens.csv"""
+        async with self._lock:
+            if self._tokens_dict is None or not self._token_log_mutations:
+                return
+            await self._write_tracked_tokens()
     
     async def save_tracked_tokens(self, tokens: List[str], token_thresholds: Dict[str, Dict] = None):
         """Save the list of tracked tokens to a file with optional thresholds and directions"""
+        token_thresholds = token_thresholds or {}
         async with self._lock:
-            file_path = self.data_dir / "tracked_tokens.csv"
-            token_thresholds = token_thresholds or {}
-            
-            data = []
+            self._tokens_dict = {}
             for token in tokens:
                 threshold_config = token_thresholds.get(token, {})
-                data.append({
-                    'token_address': token,
-                    'added_timestamp': datetime.now().isoformat(),
-                    'threshold': threshold_config.get('value', 0.0),  # 0.0 means use global threshold
-                    'direction': threshold_config.get('direction', 'both')  # both, positive, negative
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_csv(file_path, index=False)
+                self._tokens_dict[token] = self._token_entry(
+                    threshold_config.get('value', 0.0),
+                    threshold_config.get('direction', 'both')
+                )
+            await self._write_tracked_tokens()
     
     async def load_tracked_tokens(self) -> Tuple[List[str], Dict[str, Dict]]:
         """Load the list of tracked tokens from file with their thresholds and directions"""
-        file_path = self.data_dir / "tracked_tokens.csv"
-        
-        if not file_path.exists():
-            return [], {}
-        
-        try:
-            df = pd.read_csv(file_path)
-            if df.empty:
-                return [], {}
-            
-            tokens = df['token_address'].tolist()
-            thresholds = {}
-            
-            # Load thresholds and directions if columns exist
-            if 'threshold' in df.columns:
-                for _, row in df.iterrows():
-                    token = row['token_address']
-                    threshold = row.get('threshold', 0.0)
-                    direction = row.get('direction', 'both')
-                    
-                    if threshold > 0:  # Only store non-zero thresholds
-                        thresholds[token] = {
-                            'value': threshold,
-                            'direction': direction
-                        }
-                        
+        async with self._lock:
+            await self._ensure_tokens_loaded()
+            tokens = list(self._tokens_dict)
+            thresholds = {
+                token: {'value': entry['value'], 'direction': entry['direction']}
+                for token, entry in self._tokens_dict.items() if entry['value'] > 0
+            }
             return tokens, thresholds
-        except Exception:
-            return [], {}
     
     async def add_tracked_token(self, token_address: str, threshold: float = 0.0, direction: str = 'both'):
         """Add a single token to the tracked list with optional threshold and direction"""
-        current_tokens, current_thresholds = await self.load_tracked_tokens()
-        if token_address not in current_tokens:
-            current_tokens.append(token_address)
-            if threshold > 0:
-                current_thresholds[token_address] = {'value': threshold, 'direction': direction}
-            await self.save_tracked_tokens(current_tokens, current_thresholds)
+        async with self._lock:
+            await self._ensure_tokens_loaded()
+            if token_address not in self._tokens_dict:
+                self._tokens_dict[token_address] = self._token_entry(threshold, direction)
+                await self._log_token_change('add', token_address, threshold, direction)
     
     async def remove_tracked_token(self, token_address: str):
         """Remove a single token from the tracked list"""
-        current_tokens, current_thresholds = await self.load_tracked_tokens()
-        if token_address in current_tokens:
-            current_tokens.remove(token_address)
-            current_thresholds.pop(token_address, None)
-            await self.save_tracked_tokens(current_tokens, current_thresholds)
+        async with self._lock:
+            await self._ensure_tokens_loaded()
+            if self._tokens_dict.pop(token_address, None) is not None:
+                await self._log_token_change('remove', token_address)
     
     async def set_token_threshold(self, token_address: str, threshold: float, direction: str = 'both'):
         """Set a specific threshold and direction for a token"""
-        current_tokens, current_thresholds = await self.load_tracked_tokens()
-        if token_address in current_tokens:
-            if threshold > 0:
-                current_thresholds[token_address] = {'value': threshold, 'direction': direction}
-            else:
-                current_thresholds.pop(token_address, None)
-            await self.save_tracked_tokens(current_tokens, current_thresholds)
+        async with self._lock:
+            await self._ensure_tokens_loaded()
+            entry = self._tokens_dict.get(token_address)
+            if entry is not None:
+                entry.update(self._token_entry(threshold, direction, entry['added_timestamp']))
+                await self._log_token_change('threshold', token_address, threshold, direction)
     
     async def get_token_threshold(self, token_address: str) -> Optional[Dict]:
         """Get the specific threshold and direction for a token"""
-        _, thresholds = await self.load_tracked_tokens()
-        return thresholds.get(token_address)
\ No newline at end of file
+        async with self._lock:
+            await self._ensure_tokens_loaded()
+            entry = self._tokens_dict.get(token_address)
+            if entry is None or entry['value'] <= 0:
+                return None
+            return {'value': entry['value'], 'direction': entry['direction']}
@@ -1,145 +1,380 @@
-import json
+import asyncio
+import atexit
 import os
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 import logging
 
+from ..utils.config import registered_at_now
+from ..utils.jsonio import dumps, load_file, loads, write_atomic, write_durable
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait after a change before writing it out, so bursts of changes share one write
+_SAVE_DELAY = 0.25
+_SAVE_MAX_DELAY = 2.0  # Longest a change waits for its journal write under a steady stream of mutations
+
+# Version of the user record layout; stored as the snapshot's "__schema__" key once migration has run
+_SCHEMA_VERSION = 2
+
+# Threshold directions as compact ints for the per-check comparison, indexed by their stored names
+DIRECTION_BOTH, DIRECTION_POSITIVE, DIRECTION_NEGATIVE = range(3)
+DIRECTIONS = ('both', 'positive', 'negative')
+_DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+# Minimum journal records appended to chat_ids.json.log before they are folded into the snapshot
+_JOURNAL_COMPACT_EVERY = 200
+
+
+@dataclass(slots=True)
+class UserRecord:
+    """One user's settings and tracked tokens; serialized as a plain object in chat_ids.json"""
+    active: bool = True
+    registered_at: str = ''
+    tracked_tokens: List[str] = field(default_factory=list)
+    global_threshold: float = 20.0
+    token_thresholds: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    entry_prices: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # token -> {'price', 'timestamp'}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserRecord':
+        """Build a record from its JSON form; legacy records without tracked_tokens get the defaults"""
+        registered_at = data.get('registered_at') or registered_at_now()
+        if 'tracked_tokens' not in data:
+            return cls(active=data.get('active', True), registered_at=registered_at)
+        return cls(
+            active=data.get('active', False),
+            registered_at=registered_at,
+            # Share one str object per address, and drop duplicates so the list matches its membership set
+            tracked_tokens=list(dict.fromkeys(sys.intern(t) for t in data['tracked_tokens'])),
+            global_threshold=data.get('global_threshold', 20.0),
+            token_thresholds=data.get('token_thresholds', {}),
+            entry_prices=data.get('entry_prices', {})
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form of the record, for the stdlib json fallback"""
+        return {
+            'active': self.active,
+            'registered_at': self.registered_at,
+            'tracked_tokens': self.tracked_tokens,
+            'global_threshold': self.global_threshold,
+            'token_thresholds': self.token_thresholds,
+            'entry_prices': self.entry_prices
+        }
+
 
 class UserManager:
+    # Unlocked: every caller runs on the event loop thread, and atexit's close() runs after the loop has stopped
     def __init__(self, config_dir: str = "config"):
         self.config_dir = config_dir
         self.users_file = os.path.join(config_dir, "chat_ids.json")
-        self.users = {}
+        self.journal_file = self.users_file + '.log'
+        self.users: Dict[str, UserRecord] = {}
+        self._schema: Optional[int] = None
+        self._tracked: Dict[str, Set[str]] = {}  # user_id -> set of tracked token addresses
+        self._token_users: Dict[str, Set[str]] = {}  # token address -> ids of every user tracking it
+        self._active: Set[str] = set()  # ids of active users
+        self._active_tokens: Dict[str, int] = {}  # token address -> number of active users tracking it
+        self._entry_prices: Dict[str, Dict[str, float]] = {}  # user_id -> token address -> entry price, flattened for reads
+        # (user_id, token_address) -> effective threshold for tracked tokens only; cleared whenever any threshold or tracking changes
+        self._threshold_cache: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._rule_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}  # Same key -> (value, direction code)
+        self._dirty_users: Set[str] = set()  # Users changed since the last journal write
+        self._journal_entries = 0
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_deadline: Optional[float] = None  # Loop time by which the pending write must happen
         self._load_users()
         self._migrate_if_needed()
+        if self._journal_entries:
+            # Fold replayed changes into the snapshot so readers of chat_ids.json see them
+            self._save_users()
+        self._rebuild_indexes()
+        atexit.register(self.close)
     
     def _load_users(self):
-        """Load users from chat_ids.json"""
+        """Load users from chat_ids.json plus any changes journaled after it was written"""
         if os.path.exists(self.users_file):
             try:
-                with open(self.users_file, 'r') as f:
-                    self.users = json.load(f)
+                with open(self.users_file, 'rb') as f:
+                    data = load_file(f)
+                self._schema = data.pop('__schema__', None)
+                self.users = {
+                    user_id: UserRecord.from_dict(user_data)
+                    for user_id, user_data in data.items() if isinstance(user_data, dict)
+                }
             except Exception as e:
                 logger.error(f"Error loading users: {e}")
                 self.users = {}
+        self._replay_journal()
+    
+    def _rebuild_indexes(self):
+        """Rebuild the in-memory token/user indexes from self.users"""
+        self._tracked = {user_id: set(user.tracked_tokens) for user_id, user in self.users.items()}
+        self._token_users = {}
+        self._active = set()
+        self._active_tokens = {}
+        self._entry_prices = {
+            user_id: {token: entry['price'] for token, entry in user.entry_prices.items()}
+            for user_id, user in self.users.items()
+        }
+        for user_id, tokens in self._tracked.items():
+            if self.users[user_id].active:
+                self._active.add(user_id)
+            for token_address in tokens:
+                self._index_add(user_id, token_address)
+    
+    def _index_add(self, user_id: str, token_address: str):
+        """Record that a user tracks a token in the reverse and active-token indexes"""
+        self._token_users.setdefault(token_address, set()).add(user_id)
+        if user_id in self._active:
+            self._active_tokens[token_address] = self._active_tokens.get(token_address, 0) + 1
+    
+    def _index_remove(self, user_id: str, token_address: str):
+        """Drop a user/token pair from the reverse and active-token indexes"""
+        users = self._token_users.get(token_address)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._token_users[token_address]
+        # Only tracked pairs are cached, so the pair's cached thresholds go with it
+        self._threshold_cache.pop((user_id, token_address), None)
+        self._rule_cache.pop((user_id, token_address), None)
+        if user_id in self._active:
+            self._decrement_active_token(token_address)
+    
+    def _decrement_active_token(self, token_address: str):
+        """Count one fewer active tracker for a token, dropping it at zero"""
+        remaining = self._active_tokens.get(token_address, 0) - 1
+        if remaining > 0:
+            self._active_tokens[token_address] = remaining
+        else:
+            self._active_tokens.pop(token_address, None)
+    
+    def _set_active(self, user_id: str, active: bool):
+        """Set a user's active flag and move their tokens in or out of the active-token index"""
+        self.users[user_id].active = active
+        if active == (user_id in self._active):
+            return
+        if active:
+            self._active.add(user_id)
+            for token_address in self._tracked.get(user_id, ()):
+                self._active_tokens[token_address] = self._active_tokens.get(token_address, 0) + 1
+        else:
+            self._active.discard(user_id)
+            for token_address in self._tracked.get(user_id, ()):
+                self._decrement_active_token(token_address)
+    
+    def _replay_journal(self):
+        """Apply the user records journaled since the last snapshot, in order"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append; everything before it is intact
+                    logger.warning("Ignoring truncated record in users journal")
+                    break
+                self.users[record['user']] = UserRecord.from_dict(record['data'])
+                self._journal_entries += 1
     
     def _save_users(self):
-        """Save users to chat_ids.json"""
+        """Save users to chat_ids.json atomically: write a temp file, fsync, then rename over"""
         try:
-            with open(self.users_file, 'w') as f:
-                json.dump(self.users, f, indent=2)
+            write_atomic(self.users_file, dumps({'__schema__': self._schema, **self.users}, default=UserRecord.to_dict))
+            # The snapshot now holds every journaled change
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_entries = 0
         except Exception as e:
             logger.error(f"Error saving users: {e}")
     
-    def _migrate_if_needed(self):
-        """Migrate old format to new format if needed"""
-        migration_needed = False
-        
-        for user_id, user_data in self.users.items():
-            if isinstance(user_data, dict):
-                # Check if it's the old format
-                if 'tracked_tokens' not in user_data:
-                    migration_needed = True
-                    # Migrate to new format
-                    self.users[user_id] = {
-                        'active': user_data.get('active', True),
-                        'registered_at': user_data.get('registered_at', datetime.now().strftime("%a %b %d %I:%M:%S %p %Z %Y")),
-                        'tracked_tokens': [],
-                        'global_threshold': 20.0,  # Default threshold
-                        'token_thresholds': {},
-                        'entry_prices': {}  # Store entry prices for tokens
-                    }
+    def _mark_dirty(self, user_id: str):
+        """Schedule a debounced journal write for a user; without a running event loop, write right away"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self._dirty_users.add(user_id)
+        if loop is not None:
+            now = loop.time()
+            if self._save_handle is not None:
+                self._save_handle.cancel()
+            if self._save_deadline is None:
+                self._save_deadline = now + _SAVE_MAX_DELAY
+            self._save_handle = loop.call_at(min(now + _SAVE_DELAY, self._save_deadline), self._flush)
+        else:
+            self._flush()
+    
+    def _flush(self):
+        """Append one record per changed user to the journal, compacting once it has grown"""
+        self._save_handle = None
+        self._save_deadline = None
+        if not self._dirty_users:
+            return
+        records = b''.join(
+            dumps({'user': user_id, 'data': self.users[user_id]}, default=UserRecord.to_dict) + b'\n'
+            for user_id in self._dirty_users if user_id in self.users
+        )
+        self._dirty_users.clear()
+        try:
+            write_durable(self.journal_file, records, os.O_APPEND)
+            self._journal_entries += records.count(b'\n')
+        except Exception as e:
+            logger.error(f"Error writing users journal: {e}")
+            self._save_users()
+            return
         
-        if migration_needed:
-            logger.info("Migrated user data to new format")
+        # Scale compaction with the user count so each mutation costs O(1) user records written, amortized
+        if self._journal_entries >= max(_JOURNAL_COMPACT_EVERY, len(self.users)):
             self._save_users()
     
+    def close(self):
+        """Cancel any scheduled write, flush pending changes and fold the journal into the snapshot"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._flush()
+        if self._journal_entries:
+            self._save_users()
+    
+    def _migrate_if_needed(self):
+        """Stamp the snapshot with the current schema version if it predates it"""
+        # Legacy records are already upgraded by UserRecord.from_dict; this only persists the result once
+        if self._schema == _SCHEMA_VERSION:
+            return
+        if not self.users:
+            # Fresh install: nothing to migrate, the first save writes the current version
+            self._schema = _SCHEMA_VERSION
+            return
+        
+        logger.info(f"Migrated user data to schema version {_SCHEMA_VERSION}")
+        self._schema = _SCHEMA_VERSION
+        self._save_users()
+    
     def register_user(self, user_id: str) -> bool:
         """Register a new user or reactivate existing user"""
         if user_id not in self.users:
-            self.users[user_id] = {
-                'active': True,
-                'registered_at': datetime.now().strftime("%a %b %d %I:%M:%S %p %Z %Y"),
-                'tracked_tokens': [],
-                'global_threshold': 20.0,
-                'token_thresholds': {},
-                'entry_prices': {}
-            }
+            self.users[user_id] = UserRecord(registered_at=registered_at_now())
+            self._tracked[user_id] = set()
+            self._active.add(user_id)
             logger.info(f"Registered new user: {user_id}")
         else:
-            self.users[user_id]['active'] = True
+            self._set_active(user_id, True)
             logger.info(f"Reactivated user: {user_id}")
         
-        self._save_users()
+        self._mark_dirty(user_id)
         return True
     
-    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+    def get_user(self, user_id: str) -> Optional[UserRecord]:
         """Get user data"""
         return self.users.get(user_id)
     
     def is_user_active(self, user_id: str) -> bool:
         """Check if user is active"""
-        user = self.get_user(user_id)
-        return user is not None and user.get('active', False)
+        return user_id in self._active
     
     def get_active_users(self) -> List[str]:
         """Get list of active user IDs"""
-        return [user_id for user_id, data in self.users.items() 
-                if data.get('active', False)]
+        return list(self._active)
+    
+    def _add_token(self, user_id: str, token_address: str, entry_price: Optional[float], timestamp: str) -> bool:
+        """Add one token for an existing user without scheduling a save"""
+        tracked = self._tracked.setdefault(user_id, set())
+        if token_address in tracked:
+            return False
+        
+        user = self.users[user_id]
+        user.tracked_tokens.append(token_address)
+        tracked.add(token_address)
+        self._index_add(user_id, token_address)
+        
+        # Store entry price if provided
+        if entry_price is not None:
+            user.entry_prices[token_address] = {
+                'price': entry_price,
+                'timestamp': timestamp
+            }
+            self._entry_prices.setdefault(user_id, {})[token_address] = entry_price
+        return True
     
     def add_token_to_user(self, user_id: str, token_address: str, entry_price: float = None) -> bool:
         """Add a token to user's tracking list"""
         if user_id not in self.users:
             return False
-        
-        if token_address not in self.users[user_id]['tracked_tokens']:
-            self.users[user_id]['tracked_tokens'].append(token_address)
-            
-            # Store entry price if provided
-            if entry_price is not None:
-                self.users[user_id]['entry_prices'][token_address] = {
-                    'price': entry_price,
-                    'timestamp': datetime.now().isoformat()
-                }
-            
-            self._save_users()
-            return True
-        return False
+        if not self._add_token(user_id, token_address, entry_price, datetime.now().isoformat()):
+            return False
+        self._mark_dirty(user_id)
+        return True
+    
+    def bulk_add_tokens(self, user_id: str, tokens: List[Tuple[str, Optional[float]]]) -> int:
+        """Add several (token_address, entry_price) pairs with one timestamp and one save; returns how many were new"""
+        timestamp = datetime.now().isoformat()
+        if user_id not in self.users:
+            return 0
+        added = sum(self._add_token(user_id, token_address, entry_price, timestamp) for token_address, entry_price in tokens)
+        if added:
+            self._mark_dirty(user_id)
+        return added
     
     def remove_token_from_user(self, user_id: str, token_address: str) -> bool:
         """Remove a token from user's tracking list"""
-        if user_id not in self.users:
-            return False
+        return self.remove_tokens_from_user(user_id, (token_address,)) == 1
+    
+    def remove_tokens_from_user(self, user_id: str, tokens: Iterable[str]) -> int:
+        """Remove several tokens in one pass with one save; returns how many were tracked"""
+        user = self.users.get(user_id)
+        tracked = self._tracked.get(user_id)
+        if user is None or not tracked:
+            return 0
         
-        if token_address in self.users[user_id]['tracked_tokens']:
-            self.users[user_id]['tracked_tokens'].remove(token_address)
-            
-            # Remove entry price if exists
-            if token_address in self.users[user_id]['entry_prices']:
-                del self.users[user_id]['entry_prices'][token_address]
-            
-            # Remove token threshold if exists
-            if token_address in self.users[user_id]['token_thresholds']:
-                del self.users[user_id]['token_thresholds'][token_address]
-            
-            self._save_users()
-            return True
-        return False
+        removed = {token_address for token_address in tokens if token_address in tracked}
+        if not removed:
+            return 0
+        tracked -= removed
+        user.tracked_tokens = [t for t in user.tracked_tokens if t not in removed]
+        entry_prices = self._entry_prices.get(user_id, {})
+        thresholds_changed = False
+        for token_address in removed:
+            self._index_remove(user_id, token_address)
+            # Drop entry price and token threshold, if any
+            user.entry_prices.pop(token_address, None)
+            entry_prices.pop(token_address, None)
+            thresholds_changed |= user.token_thresholds.pop(token_address, None) is not None
+        if thresholds_changed:
+            self._invalidate_thresholds()
+        
+        self._mark_dirty(user_id)
+        return len(removed)
     
     def get_user_tokens(self, user_id: str) -> List[str]:
         """Get list of tokens tracked by user"""
-        user = self.get_user(user_id)
-        return user.get('tracked_tokens', []) if user else []
+        user = self.users.get(user_id)
+        return user.tracked_tokens if user else []
+    
+    def user_owns_token(self, user_id: str, token_address: str) -> bool:
+        """Check whether a user tracks a token"""
+        return token_address in self._tracked.get(user_id, ())
+    
+    def get_token_context(self, user_id: str, token_address: str) -> Dict[str, Any]:
+        """Tracking flag, entry price and effective threshold for a user's token in one lookup"""
+        return {
+            'tracked': token_address in self._tracked.get(user_id, ()),
+            'entry_price': self._entry_prices.get(user_id, {}).get(token_address),
+            'threshold': self.get_user_threshold(user_id, token_address)
+        }
     
     def set_user_global_threshold(self, user_id: str, threshold: float) -> bool:
         """Set user's global threshold"""
-        if user_id not in self.users:
+        user = self.users.get(user_id)
+        if user is None:
             return False
-        
-        self.users[user_id]['global_threshold'] = threshold
-        self._save_users()
+        user.global_threshold = threshold
+        self._invalidate_thresholds()
+        self._mark_dirty(user_id)
         return True
     
     def set_user_token_threshold(self, user_id: str, token_address: str, 
@@ -148,90 +383,121 @@ class UserManager:
         if user_id not in self.users:
             return False
         
-        if token_address not in self.users[user_id]['tracked_tokens']:
+        if token_address not in self._tracked.get(user_id, ()):
             return False
         
-        self.users[user_id]['token_thresholds'][token_address] = {
+        self.users[user_id].token_thresholds[token_address] = {
             'value': threshold,
             'direction': direction
         }
-        self._save_users()
+        self._invalidate_thresholds()
+        self._mark_dirty(user_id)
         return True
     
     def get_user_threshold(self, user_id: str, token_address: str = None) -> Dict[str, Any]:
         """Get user's threshold for a token (or global if token not specified)"""
-        user = self.get_user(user_id)
+        key = (user_id, token_address)
+        cached = self._threshold_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        user = self.users.get(user_id)
         if not user:
+            # Not cached: the user may register later
             return {'value': 20.0, 'direction': 'both'}
         
-        if token_address and token_address in user.get('token_thresholds', {}):
-            return user['token_thresholds'][token_address]
-        
+        if token_address and token_address in user.token_thresholds:
+            threshold = user.token_thresholds[token_address]
+        else:
+            threshold = {
+                'value': user.global_threshold,
+                'direction': 'both'
+            }
+        if self._cacheable(user_id, token_address):
+            self._threshold_cache[key] = threshold
+        return threshold
+    
+    def get_threshold_rule(self, user_id: str, token_address: str) -> Tuple[float, int]:
+        """Effective threshold as (value, direction code) for the price check; unknown directions map to -1"""
+        rule = self._rule_cache.get((user_id, token_address))
+        if rule is None:
+            threshold = self.get_user_threshold(user_id, token_address)
+            rule = (threshold['value'], _DIRECTION_CODES.get(threshold['direction'], -1))
+            if user_id in self.users and self._cacheable(user_id, token_address):
+                self._rule_cache[(user_id, token_address)] = rule
+        return rule
+    
+    def get_thresholds_for_token(self, token_address: str) -> Dict[str, Tuple[float, int, Optional[float]]]:
+        """(threshold value, direction code, entry price) for every active user tracking a token"""
         return {
-            'value': user.get('global_threshold', 20.0),
-            'direction': 'both'
+            user_id: self.get_threshold_rule(user_id, token_address)
+                     + (self._entry_prices.get(user_id, {}).get(token_address),)
+            for user_id in self._token_users.get(token_address, ())
+            if user_id in self._active
         }
     
+    def _cacheable(self, user_id: str, token_address: Optional[str]) -> bool:
+        """Whether a resolved threshold may be cached: global ones, or tokens the user tracks, so lookups for untracked tokens don't grow the caches"""
+        return token_address is None or user_id in self._token_users.get(token_address, ())
+    
+    def _invalidate_thresholds(self):
+        """Forget every resolved threshold"""
+        self._threshold_cache.clear()
+        self._rule_cache.clear()
+    
     def get_users_tracking_token(self, token_address: str) -> List[str]:
         """Get list of users tracking a specific token"""
-        users = []
-        for user_id, data in self.users.items():
-            if data.get('active', False) and token_address in data.get('tracked_tokens', []):
-                users.append(user_id)
-        return users
+        return [user_id for user_id in self._token_users.get(token_address, ()) if user_id in self._active]
     
     def get_entry_price(self, user_id: str, token_address: str) -> Optional[float]:
         """Get user's entry price for a token"""
-        user = self.get_user(user_id)
-        if user and token_address in user.get('entry_prices', {}):
-            return user['entry_prices'][token_address]['price']
-        return None
-    
-    def set_entry_price(self, user_id: str, token_address: str, price: float) -> bool:
-        """Set entry price for a token (used for backfilling)"""
-        if user_id not in self.users:
-            return False
-        
-        if token_address not in self.users[user_id]['tracked_tokens']:
-            return False
-        
-        self.users[user_id]['entry_prices'][token_address] = {
-            'price': price,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._save_users()
-        return True
+        return self._entry_prices.get(user_id, {}).get(token_address)
     
     def get_all_tracked_tokens(self) -> set:
         """Get set of all tokens being tracked by any active user"""
-        all_tokens = set()
-        for user_id, data in self.users.items():
-            if data.get('active', False):
-                all_tokens.update(data.get('tracked_tokens', []))
-        return all_tokens
+        return set(self._active_tokens)
+    
+    def is_token_tracked(self, token_address: str) -> bool:
+        """Check whether any active user tracks a token, without copying the tracked set"""
+        return token_address in self._active_tokens
+    
+    def other_users_track(self, token_address: str, exclude: Optional[str] = None) -> bool:
+        """Check whether any active user other than `exclude` tracks a token"""
+        return any(user_id != exclude and user_id in self._active
+                   for user_id in self._token_users.get(token_address, ()))
     
     def deactivate_user(self, user_id: str) -> bool:
         """Deactivate a user (stop receiving alerts)"""
         if user_id not in self.users:
             return False
-        
-        self.users[user_id]['active'] = False
-        self._save_users()
+        self._set_active(user_id, False)
+        self._mark_dirty(user_id)
         logger.info(f"Deactivated user: {user_id}")
         return True
     
     def set_entry_price(self, user_id: str, token_address: str, price: float) -> bool:
         """Set entry price for a token (used for backfilling missing entry prices)"""
-        if user_id not in self.users:
+        if not self.set_entry_prices([(user_id, token_address, price)]):
             return False
-        
-        if 'entry_prices' not in self.users[user_id]:
-            self.users[user_id]['entry_prices'] = {}
-        
-        self.users[user_id]['entry_prices'][token_address] = {
-            'price': price,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._save_users()
         logger.info(f"Set entry price for user {user_id}, token {token_address}: ${price:.8f}")
-        return True
\ No newline at end of file
+        return True
+    
+    def set_entry_prices(self, entries: Iterable[Tuple[str, str, float]]) -> int:
+        """Set several (user_id, token_address, price) entry prices with one timestamp and one save per user; returns how many were set"""
+        timestamp = datetime.now().isoformat()
+        changed = set()
+        count = 0
+        for user_id, token_address, price in entries:
+            user = self.users.get(user_id)
+            if user is None:
+                continue
+            user.entry_prices[token_address] = {
+                'price': price,
+                'timestamp': timestamp
+            }
+            self._entry_prices.setdefault(user_id, {})[token_address] = price
+            changed.add(user_id)
+            count += 1
+        for user_id in changed:
+            self._mark_dirty(user_id)
+        return count
\ No newline at end of file
@@ -1,15 +1,72 @@
 import asyncio
+import aiohttp
 import logging
+import time
 from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from ..api import DexScreenerAPI, SolanaTracker, APIError
 from ..storage import CSVStorage
-from ..storage.user_manager import UserManager
+from ..storage.user_manager import UserManager, DIRECTION_BOTH, DIRECTION_POSITIVE, DIRECTION_NEGATIVE, DIRECTIONS
 from ..bot import TelegramNotifier
-from ..utils import config
+from ..utils import get_config
+from ..utils.tokens import INFO_FIELDS, MARKET_FIELDS, PRICE, SOLANA_ADDR_RE, activity_lines, change_lines, render_fields
 
 logger = logging.getLogger(__name__)
 
+
+class _TokenLog(logging.LoggerAdapter):
+    """Tags records with the token they concern: a `token` record attribute and a [token] prefix"""
+    
+    def __init__(self, base: logging.Logger, token_address: str):
+        super().__init__(base, {'token': token_address})
+    
+    def process(self, msg, kwargs):
+        # Only called for records that pass the level check, so the prefix is built once per emitted line
+        kwargs['extra'] = self.extra
+        return f"[{self.extra['token']}] {msg}", kwargs
+
+# Matches the notifier's alert timestamp format
+_ALERT_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Display format for user-facing lookups, which are stamped in UTC
+_UTC_TIME_FORMAT = '%Y-%m-%d %H:%M:%S UTC'
+
+
+def _tick() -> Tuple[str, str]:
+    """Current time as (ISO timestamp for storage, display string for alerts)"""
+    now = datetime.now()
+    return now.isoformat(), now.strftime(_ALERT_TIME_FORMAT)
+
+
+# Seconds a fetched DexScreener result may be reused: prices go stale fast, names and links rarely change
+_PRICE_TTL = 30
+_METADATA_TTL = 3600
+
+
+# Seconds between stored samples while a token's price stays exactly the same
+_UNCHANGED_SAVE_EVERY = 600
+
+# Seconds between sweeps dropping cached state of deactivated users and untracked tokens
+_PRUNE_INTERVAL = 3600
+
+# Most the price poll interval stretches, as a multiple of check_interval, while no tracked price moves
+_MAX_PRICE_BACKOFF = 10
+
+# Most queued storage writes the writer task issues together per wakeup
+_WRITE_BATCH = 64
+
+
+def _threshold_hits(price: float, refs: List[float], rules: List[Tuple[float, int]]) -> Tuple[List[float], List[int]]:
+    """Percent change of price from each reference, and the indices whose matching (value, direction) rule it crosses"""
+    changes = [((price - ref) / ref) * 100 for ref in refs]
+    hits = [
+        i for i, (change, (value, direction)) in enumerate(zip(changes, rules))
+        if (direction == DIRECTION_BOTH and abs(change) >= value) or
+           (direction == DIRECTION_POSITIVE and change >= value) or
+           (direction == DIRECTION_NEGATIVE and change <= -value)
+    ]
+    return changes, hits
+
+
 class TokenTracker:
     def __init__(self, 
                  user_manager: UserManager,
@@ -20,40 +77,97 @@ class TokenTracker:
         self.storage = storage
         self.notifier = notifier
         self.check_interval = check_interval
-        self.dexscreener_api = DexScreenerAPI()
-        self.solana_tracker = SolanaTracker(config.solana_rpc_url)
+        config = get_config()
+        self._holder_concurrency = config.max_concurrency
+        # One keep-alive pool for both API clients, sized to the holder lookups' concurrency
+        self._connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=config.max_concurrency,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.dexscreener_api = DexScreenerAPI(connector=self._connector)
+        self.solana_tracker = SolanaTracker(config.solana_rpc_url, connector=self._connector)
         self._running = False
+        self._stop_event = asyncio.Event()  # Set by stop() to cut the loops' waits short
+        self._price_wake = asyncio.Event()  # Set by invalidate() (and stop()) to start the next price round now
+        self._write_queue: asyncio.Queue = asyncio.Queue()  # (storage coroutine function, args) awaiting the writer task
+        self._writer_task: Optional[asyncio.Task] = None
         self._price_cache: Dict[str, float] = {}
         self._holder_cache: Dict[str, int] = {}
         self._user_price_cache: Dict[str, Dict[str, float]] = {}  # Per-user price tracking
+        self._symbol_cache: Dict[str, str] = {}  # Token address -> symbol, filled from every price fetch
+        self._symbol_index: Dict[str, str] = {}  # Lowercased symbol -> token address
+        self._name_index: Dict[str, str] = {}  # Lowercased name -> token address
+        self._price_data_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # Token address -> (monotonic time, price data)
+        self._price_saved_at: Dict[str, float] = {}  # Token address -> monotonic time its last sample was queued
+        # Token address -> user id -> (reference price, threshold, direction code) at that user's last threshold check
+        self._checked_inputs: Dict[str, Dict[str, Tuple[float, float, int]]] = {}
+        self._price_fetches: Dict[str, asyncio.Task] = {}  # Token address -> in-flight DexScreener fetch shared by concurrent misses
     
     async def start(self):
         self._running = True
+        self._stop_event.clear()
         await self.notifier.start()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        # Open the API sessions once for the tracker's lifetime; stop() closes them
+        await self.dexscreener_api.__aenter__()
+        await self.solana_tracker.__aenter__()
         
         await self._initialize_cache()
         await self._backfill_missing_entry_prices()
         
         tasks = [
             asyncio.create_task(self._track_prices()),
-            asyncio.create_task(self._track_holders())
+            asyncio.create_task(self._track_holders()),
+            asyncio.create_task(self._run_every(_PRUNE_INTERVAL, self._prune_caches, "Cache prune"))
         ]
         
         await asyncio.gather(*tasks)
     
     async def stop(self):
         self._running = False
+        self._stop_event.set()
+        self._price_wake.set()
         await self.notifier.stop()
+        # Let queued samples and alert logs reach disk before compacting
+        if self._writer_task is not None:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            self._writer_task = None
+        await self.storage.compact()
         await self.dexscreener_api.__aexit__(None, None, None)
         await self.solana_tracker.__aexit__(None, None, None)
+        await self._connector.close()
+    
+    def _queue_write(self, save, *args):
+        """Hand a storage write to the writer task instead of awaiting the disk inline"""
+        self._write_queue.put_nowait((save, args))
+    
+    async def _writer_loop(self):
+        """Drain queued storage writes, issuing whatever has piled up together"""
+        while True:
+            batch = [await self._write_queue.get()]
+            while len(batch) < _WRITE_BATCH and not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            # Per-file locks are FIFO, so rows for the same file still land in queue order
+            results = await asyncio.gather(*(save(*args) for save, args in batch), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error writing to storage: {result}")
+            for _ in batch:
+                self._write_queue.task_done()
     
     async def _initialize_cache(self):
-        # Initialize global price cache for all tracked tokens
-        all_tokens = self.user_manager.get_all_tracked_tokens()
-        for token in all_tokens:
-            latest_price = await self.storage.get_latest_price(token)
-            if latest_price:
-                self._price_cache[token] = latest_price['price']
+        # Initialize global price and holder caches for all tracked tokens, so the first round after a restart can alert
+        all_tokens = list(self.user_manager.get_all_tracked_tokens())
+        latest_prices, latest_holders = await asyncio.gather(
+            self.storage.get_latest_prices(all_tokens),
+            self.storage.get_latest_holder_counts(all_tokens)
+        )
+        self._price_cache.update(latest_prices)
+        self._holder_cache.update(latest_holders)
         
         # Initialize per-user price cache with entry prices
         for user_id in self.user_manager.get_active_users():
@@ -71,149 +185,295 @@ class TokenTracker:
         logger.info("🔧 Starting entry price backfill for tracked tokens...")
         backfilled_count = 0
         
-        for user_id in self.user_manager.get_active_users():
-            user_tokens = self.user_manager.get_user_tokens(user_id)
-            for token_address in user_tokens:
-                entry_price = self.user_manager.get_entry_price(user_id, token_address)
-                
-                if entry_price is None:
-                    # Missing entry price, try to get current price and set it
-                    try:
-                        price_data = await self.dexscreener_api.get_token_price(token_address)
-                        current_price = price_data['price']
-                        
-                        # Set current price as entry price for backfill
-                        self.user_manager.set_entry_price(user_id, token_address, current_price)
-                        backfilled_count += 1
-                        
-                        logger.info(f"✅ Backfilled entry price for user {user_id}, token {price_data.get('symbol', token_address[:8])}: ${current_price:.8f}")
-                        
-                    except Exception as e:
-                        logger.warning(f"❌ Could not backfill entry price for user {user_id}, token {token_address}: {e}")
+        # (user, token) pairs missing an entry price
+        missing = [
+            (user_id, token_address)
+            for user_id in self.user_manager.get_active_users()
+            for token_address in self.user_manager.get_user_tokens(user_id)
+            if self.user_manager.get_entry_price(user_id, token_address) is None
+        ]
+        
+        if missing:
+            # Each distinct token is fetched once, 30 per request, however many users lack its entry price
+            try:
+                price_map = await self.dexscreener_api.get_token_prices_bulk(list({token for _, token in missing}))
+            except Exception as e:
+                logger.warning(f"❌ Could not fetch prices for entry price backfill: {e}")
+                price_map = {}
+            now = time.monotonic()
+            for token_address, price_data in price_map.items():
+                self._price_data_cache[token_address] = (now, price_data)
+                self._remember_token(token_address, price_data)
+            
+            # Set current price as entry price for backfill
+            entries = []
+            for user_id, token_address in missing:
+                price_data = price_map.get(token_address)
+                if price_data is None:
+                    logger.warning(f"❌ Could not backfill entry price for user {user_id}, token {token_address}: no price data")
+                    continue
+                entries.append((user_id, token_address, price_data['price']))
+                logger.info(f"✅ Backfilled entry price for user {user_id}, token {price_data['symbol']}: ${price_data['price']:.8f}")
+            backfilled_count = self.user_manager.set_entry_prices(entries)
         
         if backfilled_count > 0:
             logger.info(f"🎯 Entry price backfill complete: {backfilled_count} tokens updated")
         else:
             logger.info("✅ All tracked tokens already have entry prices")
     
+    async def _interval_sleep(self, seconds: float, wake: Optional[asyncio.Event] = None) -> bool:
+        """Sleep between rounds, returning True early once wake (default: stop()) is set"""
+        try:
+            await asyncio.wait_for((wake or self._stop_event).wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _run_every(self, interval: float, round_fn, name: str,
+                         wake: Optional[asyncio.Event] = None, max_backoff: int = 1):
+        """Run round_fn at a fixed rate until stopped; a failed or slow round does not shift the schedule.
+        
+        A round returning False saw nothing change, and the next wait doubles up to max_backoff
+        intervals; setting wake runs the next round immediately at the base rate.
+        """
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        backoff = 1
+        while self._running:
+            if wake is not None:
+                # Cleared before the round, so a wake arriving mid-round still triggers the next one
+                wake.clear()
+            try:
+                active = await round_fn()
+            except Exception as e:
+                await self.notifier.send_error_alert(f"{name} tracking error: {str(e)}")
+                active = True
+            backoff = 1 if active is not False else min(backoff * 2, max_backoff)
+            
+            # Skip ticks a long round overran instead of firing them back to back
+            now = loop.time()
+            next_run = max(next_run + interval * backoff, now)
+            if await self._interval_sleep(next_run - now, wake):
+                next_run = loop.time()
+                backoff = 1
+    
     async def _track_prices(self):
-        async with self.dexscreener_api:
-            while self._running:
-                try:
-                    # Get all unique tokens being tracked by any user
-                    all_tokens = self.user_manager.get_all_tracked_tokens()
-                    
-                    for token in all_tokens:
-                        await self._check_price(token)
-                    
-                    await asyncio.sleep(self.check_interval)
-                except Exception as e:
-                    await self.notifier.send_error_alert(f"Price tracking error: {str(e)}")
-                    await asyncio.sleep(30)
+        await self._run_every(self.check_interval, self._price_round, "Price",
+                              self._price_wake, _MAX_PRICE_BACKOFF)
     
     async def _track_holders(self):
-        async with self.solana_tracker:
-            while self._running:
-                try:
-                    # Get all unique tokens being tracked by any user
-                    all_tokens = self.user_manager.get_all_tracked_tokens()
-                    
-                    for token in all_tokens:
-                        await self._check_holders(token)
-                    
-                    await asyncio.sleep(self.check_interval * 5)
-                except Exception as e:
-                    await self.notifier.send_error_alert(f"Holder tracking error: {str(e)}")
-                    await asyncio.sleep(60)
+        await self._run_every(self.check_interval * 5, self._holder_round, "Holder")
+    
+    async def _price_round(self):
+        # Get all unique tokens being tracked by any user
+        all_tokens = self.user_manager.get_all_tracked_tokens()
+        
+        # One timestamp per polling round, shared by every sample and alert in it
+        tick = _tick()
+        # One request per 30 tokens instead of one per token
+        price_map = await self.dexscreener_api.get_token_prices_bulk(list(all_tokens))
+        for token in all_tokens.difference(price_map):
+            logger.warning("No price data for token %s this round", token)
+        # Checked before processing overwrites the cache; an empty or failed fetch never counts as quiet
+        moved = not price_map or any(
+            price_data['price'] != self._price_cache.get(token) for token, price_data in price_map.items()
+        )
+        tokens = list(price_map)
+        results = await asyncio.gather(*(
+            self._process_price_update(token, price_map[token], tick) for token in tokens
+        ), return_exceptions=True)
+        self._log_round_failures("price", tokens, results)
+        return moved
+    
+    async def _holder_round(self):
+        # Get all unique tokens being tracked by any user
+        all_tokens = self.user_manager.get_all_tracked_tokens()
+        
+        tick = _tick()
+        counts = await self.solana_tracker.get_token_holders_counts_batch(
+            list(all_tokens), self._holder_concurrency
+        )
+        tokens = list(counts)
+        results = await asyncio.gather(*(
+            self._process_holder_update(token, counts[token], tick) for token in tokens
+        ), return_exceptions=True)
+        self._log_round_failures("holder", tokens, results)
+    
+    @staticmethod
+    def _log_round_failures(kind: str, tokens: List[str], results: List[Any]):
+        """Log tokens whose update raised, so one failure never cancels the rest of a round"""
+        for token, result in zip(tokens, results):
+            if isinstance(result, Exception):
+                _TokenLog(logger, token).error("Unhandled %s update error: %s", kind, result)
     
-    async def _check_price(self, token_address: str):
+    async def _prune_caches(self):
+        """Drop reference prices of deactivated users or removed tokens, and cached data of tokens nobody tracks"""
+        active_users = set(self.user_manager.get_active_users())
+        for user_id in list(self._user_price_cache):
+            if user_id not in active_users:
+                del self._user_price_cache[user_id]
+                continue
+            prices = self._user_price_cache[user_id]
+            for token_address in [t for t in prices if not self.user_manager.user_owns_token(user_id, t)]:
+                del prices[token_address]
+        
+        tracked = self.user_manager.get_all_tracked_tokens()
+        for cache in (self._price_cache, self._holder_cache, self._price_data_cache, self._price_saved_at, self._checked_inputs):
+            for token_address in [t for t in cache if t not in tracked]:
+                del cache[token_address]
+    
+    async def _process_price_update(self, token_address: str, price_data: Dict[str, Any],
+                                    tick: Optional[Tuple[str, str]] = None):
+        """Store a fetched price sample and alert every user whose threshold it crosses"""
+        timestamp, time_str = tick or _tick()
         try:
-            logger.info(f"Checking price for token {token_address}")
-            price_data = await self.dexscreener_api.get_token_price(token_address)
             current_price = price_data['price']
+            now = time.monotonic()
+            self._price_data_cache[token_address] = (now, price_data)
+            self._remember_token(token_address, price_data)
+            
+            unchanged = current_price == self._price_cache.get(token_address)
+            if unchanged:
+                # Same quote as last round: only keep a periodic sample
+                last_saved = self._price_saved_at.get(token_address)
+                if last_saved is None or now - last_saved >= _UNCHANGED_SAVE_EVERY:
+                    self._queue_write(self.storage.save_price_data, token_address, price_data, timestamp)
+                    self._price_saved_at[token_address] = now
+                logger.debug("Price unchanged for %s at $%.8f", price_data['symbol'], current_price)
+            else:
+                # Log detailed token information; %-style can't group thousands, so guard the f-string instead
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Token data: {price_data['name']} ({price_data['symbol']}) - Price: ${current_price:.8f}, Market Cap: ${price_data.get('market_cap', 0):,.2f}, Liquidity: ${price_data.get('liquidity', 0):,.2f}")
+                
+                self._queue_write(self.storage.save_price_data, token_address, price_data, timestamp)
+                self._price_saved_at[token_address] = now
             
-            # Log detailed token information
-            logger.info(f"Token data: {price_data['name']} ({price_data['symbol']}) - Price: ${current_price:.8f}, Market Cap: ${price_data.get('market_cap', 0):,.2f}, Liquidity: ${price_data.get('liquidity', 0):,.2f}")
-            
-            await self.storage.save_price_data(token_address, price_data)
+            # Thresholds (direction pre-encoded as an int) and entry prices of every tracking user, in one call
+            user_configs = self.user_manager.get_thresholds_for_token(token_address)
             
-            # Check price changes for each user tracking this token
-            users_tracking = self.user_manager.get_users_tracking_token(token_address)
+            # Bound once for the per-user loops below
+            name = price_data['name']
+            symbol = price_data['symbol']
+            user_prices = self._user_price_cache
             
-            for user_id in users_tracking:
+            # Split users into those with a reference price and those seen for the first time
+            user_refs = []
+            rules = []
+            for user_id, (token_threshold, direction, entry_price) in user_configs.items():
                 # Get user's reference price (entry price or last alert price)
-                user_ref_price = self._user_price_cache.get(user_id, {}).get(token_address)
-                
+                prices = user_prices.get(user_id)
+                user_ref_price = prices.get(token_address) if prices else None
+                if not user_ref_price and entry_price:
+                    # Reference pruned while the user was inactive: restore it from the stored entry price
+                    if prices is None:
+                        prices = user_prices[user_id] = {}
+                    user_ref_price = prices[token_address] = entry_price
                 if user_ref_price and user_ref_price > 0:
-                    change_percent = ((current_price - user_ref_price) / user_ref_price) * 100
-                    
-                    # Get user-specific threshold
-                    threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
-                    token_threshold = threshold_config['value']
-                    token_direction = threshold_config['direction']
-                    
-                    # Check if the change meets the directional criteria
-                    meets_threshold = False
-                    if token_direction == 'both':
-                        meets_threshold = abs(change_percent) >= token_threshold
-                    elif token_direction == 'positive':
-                        meets_threshold = change_percent >= token_threshold
-                    elif token_direction == 'negative':
-                        meets_threshold = change_percent <= -token_threshold
-                    
-                    if meets_threshold:
-                        logger.warning(f"PRICE ALERT for user {user_id}: {price_data['name']} ({price_data['symbol']}) changed {change_percent:+.2f}%")
-                        
-                        alert_data = {
-                            'token_address': token_address,
-                            'token_name': price_data['name'],
-                            'token_symbol': price_data['symbol'],
-                            'old_price': user_ref_price,
-                            'new_price': current_price,
-                            'change_percent': change_percent,
-                            'market_cap': price_data.get('market_cap', 0),
-                            'liquidity': price_data.get('liquidity', 0),
-                            'volume_24h': price_data.get('volume_24h', 0),
-                            'dex': price_data.get('dex', 'unknown'),
-                            'user_id': user_id,
-                            'entry_price': self.user_manager.get_entry_price(user_id, token_address)
-                        }
-                        
-                        await self.notifier.send_price_alert_to_user(user_id, alert_data)
-                        
-                        await self.storage.save_alert_log({
-                            'token_address': token_address,
-                            'alert_type': 'price',
-                            'old_value': user_ref_price,
-                            'new_value': current_price,
-                            'change_percent': change_percent,
-                            'user_id': user_id
-                        })
-                    else:
-                        direction_str = f"({token_direction})" if token_direction != 'both' else ""
-                        logger.debug(f"Price change for {price_data['symbol']} user {user_id} ({change_percent:+.2f}%) below threshold ({token_threshold}% {direction_str})")
+                    user_refs.append((user_id, user_ref_price, entry_price))
+                    rules.append((token_threshold, direction))
                 else:
                     # First time tracking for this user
-                    if user_id not in self._user_price_cache:
-                        self._user_price_cache[user_id] = {}
-                    self._user_price_cache[user_id][token_address] = current_price
-                    logger.info(f"Initialized price tracking for user {user_id}: {price_data['name']} ({price_data['symbol']}) at ${current_price:.8f}")
+                    if prices is None:
+                        prices = user_prices[user_id] = {}
+                    prices[token_address] = current_price
+                    logger.info("Initialized price tracking for user %s: %s (%s) at $%.8f",
+                                user_id, name, symbol, current_price)
+            
+            # Record what each user is checked against; on an unchanged price only users whose reference or
+            # threshold changed since their last check can get a different result, so the rest are skipped
+            checked = {user_id: (ref,) + rule for (user_id, ref, _), rule in zip(user_refs, rules)}
+            previous = self._checked_inputs.get(token_address, {})
+            self._checked_inputs[token_address] = checked
+            if unchanged:
+                changed = [i for i, (user_id, _, _) in enumerate(user_refs) if previous.get(user_id) != checked[user_id]]
+                if not changed:
+                    return
+                user_refs = [user_refs[i] for i in changed]
+                rules = [rules[i] for i in changed]
+            
+            # Check every user's threshold in one pass over the reference prices
+            changes, hits = _threshold_hits(current_price, [ref for _, ref, _ in user_refs], rules)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                hit_set = set(hits)
+                for i, ((user_id, _, _), change_percent, (token_threshold, direction)) in enumerate(zip(user_refs, changes, rules)):
+                    if i not in hit_set:
+                        direction_str = f"({DIRECTIONS[direction]})" if direction > DIRECTION_BOTH else ""
+                        logger.debug("Price change for %s user %s (%+.2f%%) below threshold (%s%% %s)",
+                                     symbol, user_id, change_percent, token_threshold, direction_str)
+            
+            # Only users whose threshold was crossed are visited; their alerts go out together
+            alerts = []
+            # Token-wide alert fields, shared by every user's payload
+            token_alert = {
+                'token_address': token_address,
+                'token_name': name,
+                'token_symbol': symbol,
+                'new_price': current_price,
+                'market_cap': price_data.get('market_cap', 0),
+                'liquidity': price_data.get('liquidity', 0),
+                'volume_24h': price_data.get('volume_24h', 0),
+                'dex': price_data.get('dex', 'unknown')
+            }
+            send = self.notifier.send_price_alert_to_user
+            for i in hits:
+                user_id, user_ref_price, entry_price = user_refs[i]
+                change_percent = changes[i]
+                logger.warning("PRICE ALERT for user %s: %s (%s) changed %+.2f%%",
+                               user_id, name, symbol, change_percent)
+                
+                alert_data = dict(
+                    token_alert,
+                    old_price=user_ref_price,
+                    change_percent=change_percent,
+                    user_id=user_id,
+                    entry_price=entry_price
+                )
+                
+                alerts.append((
+                    send(user_id, alert_data, time_str),
+                    self._alert_log_row('price', token_address, user_id, user_ref_price, current_price, change_percent)
+                ))
+            await self._emit_alerts(alerts, timestamp)
             
             self._price_cache[token_address] = current_price
             
         except Exception as e:
-            logger.error(f"Error checking price for {token_address}: {e}")
-            console_msg = f"❌ Error checking price for {token_address}: {e}"
-            print(console_msg)
+            _TokenLog(logger, token_address).error("Error checking price: %s", e)
+    
+    @staticmethod
+    def _alert_log_row(alert_type: str, token_address: str, user_id: str,
+                       old_value: float, new_value: float, change_percent: float) -> Dict[str, Any]:
+        return {
+            'token_address': token_address,
+            'alert_type': alert_type,
+            'old_value': old_value,
+            'new_value': new_value,
+            'change_percent': change_percent,
+            'user_id': user_id
+        }
+    
+    async def _emit_alerts(self, alerts: List[Tuple[Any, Dict[str, Any]]], timestamp: str):
+        """Queue the (send coroutine, log row) pairs' rows as one write, then deliver the messages together.
+        
+        One failed send neither delays nor cancels the rest.
+        """
+        if not alerts:
+            return
+        self._queue_write(self.storage.save_alert_logs, [row for _, row in alerts], timestamp)
+        for result in await asyncio.gather(*(send for send, _ in alerts), return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending alert: {result}")
     
-    async def _check_holders(self, token_address: str):
+    async def _process_holder_update(self, token_address: str, holder_count: int,
+                                     tick: Optional[Tuple[str, str]] = None):
+        """Store a fetched holder count and alert the token's users on a large enough change"""
+        timestamp, time_str = tick or _tick()
+        log = _TokenLog(logger, token_address)
         try:
-            logger.info(f"Checking holder count for token {token_address}")
-            holder_count = await self.solana_tracker.get_token_holders_count(token_address)
-            
-            logger.info(f"Token {token_address} has {holder_count} holders")
+            log.info("Token has %d holders", holder_count)
             
-            await self.storage.save_holder_data(token_address, holder_count)
+            self._queue_write(self.storage.save_holder_data, token_address, holder_count, timestamp)
             
             if token_address in self._holder_cache:
                 old_count = self._holder_cache[token_address]
@@ -221,27 +481,22 @@ class TokenTracker:
                 if old_count != holder_count:
                     change = holder_count - old_count
                     change_percent = (change / old_count * 100) if old_count > 0 else 0
-                    logger.info(f"Holder count change for {token_address}: {change:+d} ({change_percent:+.1f}%)")
+                    log.info("Holder count change: %+d (%+.1f%%)", change, change_percent)
                     
                     if abs(change) >= 10 or abs(change_percent) >= 10:
-                        logger.warning(f"HOLDER ALERT: Token {token_address} holder count changed by {change:+d} ({change_percent:+.1f}%)")
+                        log.warning("HOLDER ALERT: holder count changed by %+d (%+.1f%%)", change, change_percent)
                         
                         # Get users tracking this token to send alerts only to them
                         users_tracking = self.user_manager.get_users_tracking_token(token_address)
                         
-                        # Get token info for better alert message
-                        token_info = {'name': 'Unknown', 'symbol': 'UNK'}
-                        try:
-                            price_data = await self.dexscreener_api.get_token_price(token_address)
-                            token_info = {'name': price_data.get('name', 'Unknown'), 'symbol': price_data.get('symbol', 'UNK')}
-                        except Exception as e:
-                            logger.debug(f"Could not get token info for holder alert: {e}")
-                            pass
+                        # Name and symbol from the price rounds' last fetch, however old: they rarely change
+                        cached = self._price_data_cache.get(token_address)
+                        price_data = cached[1] if cached is not None else {}
                         
                         alert_data = {
                             'token_address': token_address,
-                            'token_name': token_info['name'],
-                            'token_symbol': token_info['symbol'],
+                            'token_name': price_data.get('name', 'Unknown'),
+                            'token_symbol': price_data.get('symbol', 'UNK'),
                             'old_holders': old_count,
                             'new_holders': holder_count,
                             'change': change,
@@ -249,30 +504,27 @@ class TokenTracker:
                         }
                         
                         # Send alert to each user tracking this token
-                        for user_id in users_tracking:
-                            await self.notifier.send_holder_alert_to_user(user_id, alert_data)
-                        
-                        # Save alert log for each user
-                        for user_id in users_tracking:
-                            await self.storage.save_alert_log({
-                                'token_address': token_address,
-                                'alert_type': 'holders',
-                                'old_value': old_count,
-                                'new_value': holder_count,
-                                'change_percent': change_percent,
-                                'user_id': user_id
-                            })
+                        await self._emit_alerts([
+                            (
+                                self.notifier.send_holder_alert_to_user(user_id, alert_data, time_str),
+                                self._alert_log_row('holders', token_address, user_id, old_count, holder_count, change_percent)
+                            )
+                            for user_id in users_tracking
+                        ], timestamp)
                     else:
-                        logger.debug(f"Holder count change for {token_address} ({change:+d}) below alert threshold")
+                        log.debug("Holder count change (%+d) below alert threshold", change)
             else:
-                logger.info(f"New token holder tracking initialized: {token_address} with {holder_count} holders")
+                log.info("New token holder tracking initialized with %d holders", holder_count)
             
             self._holder_cache[token_address] = holder_count
             
         except Exception as e:
-            logger.error(f"Error checking holders for {token_address}: {e}")
-            console_msg = f"❌ Error checking holders for {token_address}: {e}"
-            print(console_msg)
+            log.error("Error checking holders: %s", e)
+    
+    def invalidate(self, token_address: str):
+        """Drop a token's cached price data and start the next price round right away"""
+        self._price_data_cache.pop(token_address, None)
+        self._price_wake.set()
     
     async def add_token(self, user_id: str, token_address: str):
         """Add token to user's tracking list"""
@@ -282,17 +534,15 @@ class TokenTracker:
             return False
         
         # Check if user is already tracking this token
-        user_tokens = self.user_manager.get_user_tokens(user_id)
-        if token_address in user_tokens:
+        if self.user_manager.user_owns_token(user_id, token_address):
             logger.warning(f"User {user_id} is already tracking token {token_address}")
-            console_msg = f"⚠️ User {user_id} is already tracking token {token_address}"
-            print(console_msg)
             return False
         
         # Get current price as entry price
         entry_price = None
+        self.invalidate(token_address)
         try:
-            price_data = await self.dexscreener_api.get_token_price(token_address)
+            price_data = await self._get_price_data(token_address)
             entry_price = price_data['price']
         except Exception as e:
             logger.error(f"Error getting entry price for {token_address}: {e}")
@@ -302,8 +552,6 @@ class TokenTracker:
         
         if success:
             logger.info(f"✅ Token {token_address} added to tracking for user {user_id}")
-            console_msg = f"✅ Token {token_address} added to tracking for user {user_id}"
-            print(console_msg)
             
             # Initialize user price cache if needed
             if user_id not in self._user_price_cache:
@@ -333,22 +581,20 @@ class TokenTracker:
                 del self._user_price_cache[user_id][token_address]
             
             logger.info(f"❌ Token {token_address} removed from tracking for user {user_id}")
-            console_msg = f"❌ Token {token_address} removed from tracking for user {user_id}"
-            print(console_msg)
             
             # Check if any other users are still tracking this token
-            users_still_tracking = self.user_manager.get_users_tracking_token(token_address)
-            if not users_still_tracking:
+            if not self.user_manager.is_token_tracked(token_address):
                 # No users tracking this token anymore, remove from global cache
                 self._price_cache.pop(token_address, None)
                 self._holder_cache.pop(token_address, None)
+                self._price_data_cache.pop(token_address, None)
+                self._price_saved_at.pop(token_address, None)
+                self._checked_inputs.pop(token_address, None)
                 logger.info(f"No users tracking {token_address} anymore, removed from global cache")
             
             return True
         else:
             logger.warning(f"User {user_id} was not tracking token {token_address}")
-            console_msg = f"⚠️ User {user_id} was not tracking token {token_address}"
-            print(console_msg)
             return False
     
     def update_threshold(self, user_id: str, new_threshold: float):
@@ -368,14 +614,15 @@ class TokenTracker:
     async def reset_price_reference(self, user_id: str, token_address: str):
         """Reset the price reference for a token to current price for a specific user"""
         # Check if user is tracking this token
-        user_tokens = self.user_manager.get_user_tokens(user_id)
-        if token_address not in user_tokens:
+        if not self.user_manager.user_owns_token(user_id, token_address):
             raise ValueError(f"User {user_id} is not tracking token {token_address}")
         
+        self.invalidate(token_address)
         try:
             # Get current price
-            price_data = await self.dexscreener_api.get_token_price(token_address)
+            price_data = await self._get_price_data(token_address)
             current_price = price_data['price']
+            self._remember_token(token_address, price_data)
             
             # Update user's price cache with new reference price
             if user_id not in self._user_price_cache:
@@ -386,7 +633,7 @@ class TokenTracker:
             self._price_cache[token_address] = current_price
             
             # Save the new reference price to storage
-            await self.storage.save_price_data(token_address, price_data)
+            self._queue_write(self.storage.save_price_data, token_address, price_data)
             
             logger.info(f"Price reference reset for user {user_id}, token {price_data['symbol']} to ${current_price:.8f}")
             
@@ -394,14 +641,16 @@ class TokenTracker:
             threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
             
             # Send confirmation message to specific user
-            message = f"🔄 **Price Reference Reset**\n\n"
-            message += f"📊 **Token:** {price_data['name']} ({price_data['symbol']})\n"
-            message += f"💰 **New Reference Price:** ${current_price:.8f}\n"
-            message += f"📈 **Market Cap:** ${price_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${price_data.get('liquidity', 0):,.2f}\n"
-            message += f"⏰ **Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
-            message += f"🎯 **Your Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n"
-            message += f"✅ Future alerts will use this as the new baseline price."
+            message = "".join([
+                "🔄 **Price Reference Reset**\n\n",
+                f"📊 **Token:** {price_data['name']} ({price_data['symbol']})\n",
+                f"💰 **New Reference Price:** ${current_price:.8f}\n",
+                f"📈 **Market Cap:** ${price_data.get('market_cap', 0):,.2f}\n",
+                f"💧 **Liquidity:** ${price_data.get('liquidity', 0):,.2f}\n",
+                f"⏰ **Time:** {datetime.now(timezone.utc).strftime(_UTC_TIME_FORMAT)}\n\n",
+                f"🎯 **Your Threshold:** {threshold_config['value']}% ({threshold_config['direction']})\n",
+                "✅ Future alerts will use this as the new baseline price."
+            ])
             
             await self.notifier.send_message_to_user(user_id, message)
             
@@ -421,62 +670,91 @@ class TokenTracker:
         threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
         return threshold_config['direction']
     
+    async def get_symbol(self, token_address: str) -> Optional[str]:
+        """Get a token's symbol, from memory when any earlier fetch already saw it"""
+        symbol = self._symbol_cache.get(token_address)
+        if symbol is None:
+            try:
+                price_data = await self._get_price_data(token_address, _METADATA_TTL)
+            except Exception as e:
+                logger.debug(f"Could not get symbol for {token_address}: {e}")
+                return None
+            self._remember_token(token_address, price_data)
+            symbol = price_data['symbol']
+        return symbol
+    
+    async def _get_price_data(self, token_address: str, max_age: float = _PRICE_TTL) -> Dict[str, Any]:
+        """DexScreener data for a token, reusing a result fetched within max_age seconds"""
+        cached = self._price_data_cache.get(token_address)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        
+        # Callers missing at the same time wait on one request instead of each sending their own
+        fetch = self._price_fetches.get(token_address)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_price_data(token_address))
+            self._price_fetches[token_address] = fetch
+            fetch.add_done_callback(lambda _, address=token_address: self._price_fetches.pop(address, None))
+        # Shielded so one caller being cancelled does not cancel the fetch the others are waiting on
+        return await asyncio.shield(fetch)
+    
+    async def _fetch_price_data(self, token_address: str) -> Dict[str, Any]:
+        price_data = await self.dexscreener_api.get_token_price(token_address)
+        self._price_data_cache[token_address] = (time.monotonic(), price_data)
+        self._remember_token(token_address, price_data)
+        return price_data
+    
+    def _remember_token(self, token_address: str, price_data: Dict[str, Any]):
+        """Record a fetched token's symbol and name for address lookups"""
+        symbol = price_data['symbol']
+        self._symbol_cache[token_address] = symbol
+        self._symbol_index[symbol.lower()] = token_address
+        self._name_index[price_data['name'].lower()] = token_address
+    
     def get_token_by_name_or_symbol(self, query: str) -> Optional[str]:
         """Find token address by name or symbol"""
         query_lower = query.lower()
-        # Simple lookup from cached token data
-        all_tokens = self.user_manager.get_all_tracked_tokens()
-        for token_address in all_tokens:
-            # We would need to store token metadata somewhere accessible
-            # For now, return None - this needs the storage system
-            pass
-        return None
-    
-    async def get_token_info_with_timestamp(self, token_identifier: str) -> Dict[str, Any]:
-        """Get current token information with timestamp"""
+        # Symbols first, as the more common query; both indexes are filled by every price fetch
+        return self._symbol_index.get(query_lower) or self._name_index.get(query_lower)
+    
+    async def get_token_info_with_timestamp(self, token_identifier: str, fresh: bool = False) -> Dict[str, Any]:
+        """Get current token information with timestamp; fresh skips the cached price data"""
         try:
             # Check if identifier is an address or name/symbol
             token_address = token_identifier
-            if not token_identifier.startswith(('1', '2', '3', '4', '5', '6', '7', '8', '9', 'A', 'B', 'C', 'D', 'E', 'F')):
+            if not SOLANA_ADDR_RE.match(token_identifier):
                 # Looks like name/symbol, try to find address
                 found_address = self.get_token_by_name_or_symbol(token_identifier)
-                if found_address:
-                    token_address = found_address
-                else:
-                    # Search through tracked tokens for matching name/symbol
-                    all_tokens = self.user_manager.get_all_tracked_tokens()
-                    for tracked_address in all_tokens:
-                        try:
-                            temp_data = await self.dexscreener_api.get_token_price(tracked_address)
-                            if (temp_data['name'].lower() == token_identifier.lower() or 
-                                temp_data['symbol'].lower() == token_identifier.lower()):
-                                token_address = tracked_address
-                                break
-                        except Exception as e:
-                            logger.debug(f"Could not get token info for {tracked_address}: {e}")
-                            continue
-                    else:
-                        raise APIError(f"Token '{token_identifier}' not found in tracked tokens")
+                if not found_address:
+                    raise APIError(f"Token '{token_identifier}' not found in tracked tokens")
+                token_address = found_address
             
             # Check if token is being tracked by any user
-            all_tokens = self.user_manager.get_all_tracked_tokens()
-            if token_address not in all_tokens:
+            if not self.user_manager.is_token_tracked(token_address):
                 raise APIError(f"Token '{token_identifier}' is not being tracked by any user")
             
-            # Get current data
-            token_data = await self.dexscreener_api.get_token_price(token_address)
-            
-            # Try to get holder count
-            try:
-                holder_count = await self.solana_tracker.get_token_holders_count(token_address)
-                token_data['holder_count'] = holder_count
-            except Exception as e:
-                logger.warning(f"Could not get holder count for {token_address}: {e}")
-                token_data['holder_count'] = 0
-            
-            # Add timestamp
-            token_data['fetched_at'] = datetime.now().isoformat()
-            token_data['fetched_timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+            # Price data and holder count are independent, so fetch both at once
+            price_data, holder_count = await asyncio.gather(
+                self._get_price_data(token_address, 0 if fresh else _PRICE_TTL),
+                self.solana_tracker.get_token_holders_count(token_address),
+                return_exceptions=True
+            )
+            if isinstance(price_data, Exception):
+                raise price_data
+            
+            # Copied since holder count and timestamps are added below
+            token_data = dict(price_data)
+            self._remember_token(token_address, token_data)
+            
+            if isinstance(holder_count, Exception):
+                logger.warning(f"Could not get holder count for {token_address}: {holder_count}")
+                holder_count = 0
+            token_data['holder_count'] = holder_count
+            
+            # Add timestamp, both forms from one clock read
+            now = datetime.now(timezone.utc)
+            token_data['fetched_at'] = now.isoformat()
+            token_data['fetched_timestamp'] = now.strftime(_UTC_TIME_FORMAT)
             
             return token_data
             
@@ -486,109 +764,35 @@ class TokenTracker:
     
     async def _send_token_added_confirmation(self, user_id: str, token_address: str):
         """Send Telegram confirmation with detailed token information when a new token is added"""
+        # Get user's threshold for this token; looked up once, the fallback message below needs it too
+        threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
         try:
-            # Get detailed token data from DexScreener
-            token_data = await self.dexscreener_api.get_token_price(token_address)
-            
-            # Try to get holder count
-            try:
-                holder_count = await self.solana_tracker.get_token_holders_count(token_address)
-                token_data['holder_count'] = holder_count
-            except Exception as e:
-                logger.warning(f"Could not get holder count for {token_address}: {e}")
-                token_data['holder_count'] = 0
-            
-            # Get user's threshold for this token
-            threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
+            # Get detailed token data from DexScreener, usually still cached from add_token's entry price fetch.
+            # The message shows no holder count, so none is fetched
+            token_data = await self._get_price_data(token_address)
             
             # Get entry price
             entry_price = self.user_manager.get_entry_price(user_id, token_address)
             
-            # Format confirmation message with only requested variables
-            message = f"🎯 **Token Successfully Added to Tracking!**\n\n"
-            message += f"🏷️ **Name:** {token_data['name']}\n"
-            message += f"🔤 **Symbol:** {token_data['symbol']}\n"
-            message += f"🔗 **Address:** `{token_address}`\n"
+            # Format confirmation message with the shared token info renderers; the entry price replaces the current one
+            parts = ["🎯 **Token Successfully Added to Tracking!**\n\n", *render_fields(token_data, INFO_FIELDS[:3])]
             if entry_price:
-                message += f"💰 **Entry Price:** ${entry_price:.8f}\n"
-            message += f"📈 **Market Cap:** ${token_data.get('market_cap', 0):,.2f}\n"
-            message += f"💧 **Liquidity:** ${token_data.get('liquidity', 0):,.2f}\n"
-            message += f"📊 **24h Volume:** ${token_data.get('volume_24h', 0):,.2f}\n"
-            
-            # Volume 1h and 6h if available
-            if token_data.get('volume_1h', 0) > 0:
-                message += f"📊 **1h Volume:** ${token_data['volume_1h']:,.2f}\n"
-            if token_data.get('volume_6h', 0) > 0:
-                message += f"📊 **6h Volume:** ${token_data['volume_6h']:,.2f}\n"
-            
-            # Price changes
-            if token_data.get('price_change_24h') is not None:
-                change_24h = token_data['price_change_24h']
-                emoji = "📈" if change_24h > 0 else "📉"
-                message += f"📊 **24h Change:** {emoji} {change_24h:+.2f}%\n"
-            
-            if token_data.get('price_change_1h') is not None:
-                change_1h = token_data['price_change_1h']
-                emoji = "📈" if change_1h > 0 else "📉"
-                message += f"⏰ **1h Change:** {emoji} {change_1h:+.2f}%\n"
-            
-            if token_data.get('price_change_6h') is not None:
-                change_6h = token_data['price_change_6h']
-                emoji = "📈" if change_6h > 0 else "📉"
-                message += f"⏰ **6h Change:** {emoji} {change_6h:+.2f}%\n"
-            
-            # Trading activity
-            buys_24h = token_data.get('txns_24h_buys', 0)
-            sells_24h = token_data.get('txns_24h_sells', 0)
-            if buys_24h > 0 or sells_24h > 0:
-                message += f"🔄 **24h Transactions:** {buys_24h} buys / {sells_24h} sells\n"
-            
-            # Websites
-            websites = token_data.get('websites', [])
-            if websites:
-                website_links = []
-                for website in websites:
-                    url = website.get('url', '')
-                    label = website.get('label', 'Website')
-                    if url:
-                        website_links.append(f"[{label}]({url})")
-                if website_links:
-                    message += f"🌐 **Websites:** {' | '.join(website_links)}\n"
-            
-            # Social links
-            socials = token_data.get('socials', [])
-            if socials:
-                social_links = []
-                for social in socials:
-                    social_type = social.get('type', '').lower()
-                    social_url = social.get('url', '')
-                    if social_url:
-                        if social_type == 'twitter':
-                            social_links.append(f"[Twitter]({social_url})")
-                        elif social_type == 'telegram':
-                            social_links.append(f"[Telegram]({social_url})")
-                        elif social_type == 'discord':
-                            social_links.append(f"[Discord]({social_url})")
-                        elif social_type == 'website':
-                            social_links.append(f"[Website]({social_url})")
-                        else:
-                            social_links.append(f"[{social_type.capitalize()}]({social_url})")
-                if social_links:
-                    message += f"🌐 **Socials:** {' | '.join(social_links)}\n"
-            
-            # Image URL if available
-            if token_data.get('image_url'):
-                message += f"🖼️ **Image:** [View]({token_data['image_url']})\n"
-            
-            message += f"\n🎯 **Your Alert Settings:**\n"
-            message += f"📊 **Threshold:** {threshold_config['value']}%\n"
-            message += f"🔄 **Direction:** {threshold_config['direction']}\n"
+                parts.append(f"💰 **Entry Price:** {PRICE(entry_price)}\n")
+            parts += render_fields(token_data, MARKET_FIELDS)
+            parts += change_lines(token_data)
+            parts += activity_lines(token_data)
+            
+            parts.append(
+                "\n🎯 **Your Alert Settings:**\n"
+                f"📊 **Threshold:** {threshold_config['value']}%\n"
+                f"🔄 **Direction:** {threshold_config['direction']}\n"
+            )
+            message = "".join(parts)
             
             await self.notifier.send_message_to_user(user_id, message)
             
         except Exception as e:
             logger.error(f"Error sending token added confirmation: {e}")
             # Send basic confirmation if detailed data fails
-            threshold_config = self.user_manager.get_user_threshold(user_id, token_address)
             basic_message = f"✅ **Token Added to Tracking**\n\nAddress: `{token_address}`\nNow monitoring for price changes >= {threshold_config['value']}% ({threshold_config['direction']})"
             await self.notifier.send_message_to_user(user_id, basic_message)
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .config import config, Config
+from .config import Config, get_config
 
-__all__ = ['config', 'Config']
\ No newline at end of file
+__all__ = ['Config', 'get_config']
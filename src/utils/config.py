@@ -1,13 +1,59 @@
 import os
-import json
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
-from dataclasses import dataclass
+import sys
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-load_dotenv()
+from .jsonio import dumps, loads, write_atomic
 
-@dataclass
+# `date`'s default output, the registered_at format already in chat_ids.json
+_REGISTERED_AT_FORMAT = "%a %b %d %I:%M:%S %p %Z %Y"
+
+# chat_ids.json files as last parsed: path -> ((mtime_ns, size), parsed data, active chat ids)
+_chat_ids_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any], List[str]]] = {}
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _active_ids(chat_ids: Dict[str, Any]) -> List[str]:
+    # Skip metadata keys such as UserManager's "__schema__". Interned, so every parse and caller shares one copy
+    # of each id and equality checks against other interned ids short-circuit on identity
+    return [sys.intern(chat_id) for chat_id, info in chat_ids.items()
+            if not chat_id.startswith('__') and info.get('active', True)]
+
+
+def registered_at_now() -> str:
+    """Current local time as a chat_ids.json registered_at value, shared with UserManager"""
+    # Timezone-aware, so %Z is filled in rather than left blank
+    return datetime.now().astimezone().strftime(_REGISTERED_AT_FORMAT)
+
+
+def _read_chat_ids(path: Path) -> Tuple[Dict[str, Any], List[str]]:
+    """Parsed chat_ids.json and its active ids, re-read only when the file's mtime or size changed"""
+    # EAFP throughout: the stat doubles as the existence check, and a file deleted after it reads as missing
+    try:
+        stamp = _stamp(path)
+        cached = _chat_ids_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        # Bytes straight to the parser: no text-mode wrapper or UTF-8 decode pass (both parsers accept bytes)
+        data = path.read_bytes()
+    except FileNotFoundError:
+        _chat_ids_cache.pop(path, None)
+        return {}, []
+    
+    chat_ids = loads(data)
+    active = _active_ids(chat_ids)
+    _chat_ids_cache[path] = (stamp, chat_ids, active)
+    return chat_ids, active
+
+# Frozen: every value is read from the environment once in from_env; slots keep attribute reads off a __dict__
+@dataclass(frozen=True, slots=True)
 class Config:
     telegram_bot_token: str
     telegram_chat_id: Optional[str]
@@ -16,9 +62,22 @@ class Config:
     solana_rpc_url: str
     data_dir: str
     config_dir: str
+    max_concurrency: int
+    # Derived from config_dir once, instead of rebuilding the Path on every chat id read
+    _chat_ids_file: Path = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.max_concurrency < 1:
+            raise ValueError("MAX_CONCURRENCY must be at least 1")
+        object.__setattr__(self, '_chat_ids_file', Path(self.config_dir) / 'chat_ids.json')
     
     @classmethod
     def from_env(cls) -> 'Config':
+        # Deployments that inject the environment themselves set SKIP_DOTENV to skip importing dotenv and reading .env
+        if not os.environ.get('SKIP_DOTENV'):
+            from dotenv import load_dotenv
+            load_dotenv(override=False)
+        
         base_dir = Path(__file__).parent.parent.parent
         return cls(
             telegram_bot_token=os.getenv('TELEGRAM_BOT_TOKEN', ''),
@@ -27,7 +86,8 @@ class Config:
             check_interval=int(os.getenv('CHECK_INTERVAL', '60')),
             solana_rpc_url=os.getenv('SOLANA_RPC_URL', 'https://api.mainnet-beta.solana.com'),
             data_dir=str(base_dir / 'data'),
-            config_dir=str(base_dir / 'config')
+            config_dir=str(base_dir / 'config'),
+            max_concurrency=int(os.getenv('MAX_CONCURRENCY', '8'))
         )
     
     def validate(self) -> bool:
@@ -36,33 +96,32 @@ class Config:
         return True
     
     def save_chat_id(self, chat_id: str):
-        Path(self.config_dir).mkdir(parents=True, exist_ok=True)
-        chat_ids_file = Path(self.config_dir) / 'chat_ids.json'
-        
-        chat_ids = {}
-        if chat_ids_file.exists():
-            with open(chat_ids_file, 'r') as f:
-                chat_ids = json.load(f)
+        chat_ids_file = self._chat_ids_file
+        chat_id = sys.intern(chat_id)
         
+        # Copied so the cached parse is only replaced once the write has succeeded
+        chat_ids = dict(_read_chat_ids(chat_ids_file)[0])
         chat_ids[chat_id] = {
             'active': True,
-            'registered_at': os.popen('date').read().strip()
+            'registered_at': registered_at_now()
         }
         
-        with open(chat_ids_file, 'w') as f:
-            json.dump(chat_ids, f, indent=2)
-        
-        self.telegram_chat_id = chat_id
+        # Compact, as UserManager writes it: the file is only read by code
+        data = dumps(chat_ids)
+        try:
+            write_atomic(chat_ids_file, data)
+        except FileNotFoundError:
+            # Only the very first save can find the config directory missing
+            chat_ids_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(chat_ids_file, data)
+        # Keep what was just written, stamped after the write, so the next read needs no parse
+        _chat_ids_cache[chat_ids_file] = (_stamp(chat_ids_file), chat_ids, _active_ids(chat_ids))
     
     def get_active_chat_ids(self) -> List[str]:
-        chat_ids_file = Path(self.config_dir) / 'chat_ids.json'
-        
-        if not chat_ids_file.exists():
-            return []
-        
-        with open(chat_ids_file, 'r') as f:
-            chat_ids = json.load(f)
-        
-        return [chat_id for chat_id, info in chat_ids.items() if info.get('active', True)]
+        # A copy, so callers cannot alter the cached list
+        return list(_read_chat_ids(self._chat_ids_file)[1])
 
-config = Config.from_env()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """The process-wide Config, read from the environment (and .env) on first use"""
+    return Config.from_env()
@@ -0,0 +1,51 @@
+import json
+import mmap
+import os
+from typing import Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, default: Optional[Callable] = None) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when it is available"""
+    if orjson is not None:
+        # orjson serializes dataclasses, slotted ones included, natively; default covers the rest
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, separators=(',', ':'), default=default).encode()
+
+
+def loads(data: bytes):
+    """Parse JSON bytes, with orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(f):
+    """Parse an open JSON file, mapping it into memory for orjson instead of copying it into bytes"""
+    if orjson is None or os.fstat(f.fileno()).st_size == 0:
+        return loads(f.read())
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return orjson.loads(view)
+
+
+def write_durable(path, data: bytes, mode: int):
+    """Write an encoded buffer with raw fd writes and fsync it, bypassing Python's buffered file layer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | mode, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, data: bytes):
+    """Replace a file with a fsynced temp file and a rename, so readers never see it half-written"""
+    tmp_path = os.fspath(path) + '.tmp'
+    write_durable(tmp_path, data, os.O_TRUNC)
+    os.replace(tmp_path, path)
@@ -0,0 +1,128 @@
+import re
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+# Solana token address: base58 alphabet, 32-44 characters
+SOLANA_ADDR_RE = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
+
+# Display names for DexScreener social link types; unknown types are capitalized
+SOCIAL_LABELS: Dict[str, str] = {
+    'twitter': 'Twitter',
+    'telegram': 'Telegram',
+    'discord': 'Discord',
+    'website': 'Website',
+}
+
+
+def social_links(socials: List[Dict[str, Any]]) -> List[str]:
+    """Markdown links for a token's socials, skipping entries without a URL"""
+    links = []
+    for social in socials:
+        url = social.get('url')
+        if not url:
+            continue
+        social_type = social.get('type', '').lower()
+        links.append(f"[{SOCIAL_LABELS.get(social_type) or social_type.capitalize()}]({url})")
+    return links
+
+
+# Bound formatters for money, token prices and signed percentages
+USD: Final = "${:,.2f}".format
+PRICE: Final = "${:.8f}".format
+PCT: Final = "{:+.2f}%".format
+
+# (key, label, formatter, required, default) rows of a token info message; optional rows are
+# only emitted when the value is truthy, required ones fall back to the default
+INFO_FIELDS: Final[Tuple[Tuple[str, str, Any, bool, Any], ...]] = (
+    ('name', "🏷️ **Name:**", str, True, "Unknown"),
+    ('symbol', "🔤 **Symbol:**", str, True, "Unknown"),
+    ('address', "🔗 **Address:**", "`{}`".format, True, "Unknown"),
+    ('price', "💰 **Current Price:**", PRICE, True, 0),
+)
+
+MARKET_FIELDS: Final[Tuple[Tuple[str, str, Any, bool, Any], ...]] = (
+    ('market_cap', "📈 **Market Cap:**", USD, True, 0),
+    ('liquidity', "💧 **Liquidity:**", USD, True, 0),
+    ('volume_24h', "📊 **24h Volume:**", USD, True, 0),
+    ('volume_1h', "📊 **1h Volume:**", USD, False, 0),
+    ('volume_6h', "📊 **6h Volume:**", USD, False, 0),
+)
+
+# (key, label) rows for signed percentage changes, shown whenever present
+CHANGE_FIELDS: Final[Tuple[Tuple[str, str], ...]] = (
+    ('price_change_24h', "📊 **24h Change:**"),
+    ('price_change_1h', "⏰ **1h Change:**"),
+    ('price_change_6h', "⏰ **6h Change:**"),
+)
+
+
+def render_fields(token_data: Dict[str, Any], fields) -> List[str]:
+    """Render (key, label, formatter, required, default) rows into message lines"""
+    return [
+        f"{label} {fmt(token_data.get(key) or default)}\n"
+        for key, label, fmt, required, default in fields
+        if required or token_data.get(key)
+    ]
+
+
+def entry_lines(price: float, entry_price: Optional[float]) -> List[str]:
+    """Entry price and performance since entry, when the user has an entry price"""
+    if not entry_price:
+        return []
+    price_change = ((price - entry_price) / entry_price) * 100
+    emoji = "📈" if price_change > 0 else "📉"
+    return [
+        f"📊 **Entry Price:** {PRICE(entry_price)}\n",
+        f"📊 **Entry Performance:** {emoji} {PCT(price_change)} since entry\n",
+    ]
+
+
+def change_lines(token_data: Dict[str, Any], fields=CHANGE_FIELDS) -> List[str]:
+    """Render (key, label) signed percentage change rows, skipping missing ones"""
+    lines = []
+    for key, label in fields:
+        change = token_data.get(key)
+        if change is not None:
+            emoji = "📈" if change > 0 else "📉"
+            lines.append(f"{label} {emoji} {PCT(change)}\n")
+    return lines
+
+
+def activity_lines(token_data: Dict[str, Any]) -> List[str]:
+    """24h transactions, websites, socials and image link, each only when present"""
+    lines = []
+    
+    # Trading activity
+    buys_24h = token_data.get('txns_24h_buys', 0)
+    sells_24h = token_data.get('txns_24h_sells', 0)
+    if buys_24h > 0 or sells_24h > 0:
+        lines.append(f"🔄 **24h Transactions:** {buys_24h} buys / {sells_24h} sells\n")
+    
+    # Websites
+    website_links = [
+        f"[{website.get('label', 'Website')}]({website['url']})"
+        for website in token_data.get('websites', []) if website.get('url')
+    ]
+    if website_links:
+        lines.append(f"🌐 **Websites:** {' | '.join(website_links)}\n")
+    
+    # Social links
+    links = social_links(token_data.get('socials', []))
+    if links:
+        lines.append(f"🌐 **Socials:** {' | '.join(links)}\n")
+    
+    # Image URL if available
+    if token_data.get('image_url'):
+        lines.append(f"🖼️ **Image:** [View]({token_data['image_url']})\n")
+    return lines
+
+
+def token_info_lines(token_data: Dict[str, Any], token_ctx: Dict[str, Any]) -> List[str]:
+    """Token info body: fields, entry performance for a tracked token, market data, changes and links"""
+    lines = render_fields(token_data, INFO_FIELDS)
+    if token_ctx['tracked']:
+        lines += entry_lines(token_data['price'], token_ctx['entry_price'])
+        lines.append("🎯 **You're tracking this token**\n")
+    lines += render_fields(token_data, MARKET_FIELDS)
+    lines += change_lines(token_data)
+    lines += activity_lines(token_data)
+    return lines